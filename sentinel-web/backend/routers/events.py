@@ -450,7 +450,9 @@ async def process_event_with_streaming(
                 ],
                 "metrics": _extract_metrics(s.utility_score),
                 "risks": getattr(s, 'risks', []),
-                "expected_outcomes": getattr(s, 'expected_outcomes', {})
+                # Typed model → plain dict so send_json/json.dumps can encode it;
+                # exclude_unset keeps the payload to the keys the coordinator set
+                "expected_outcomes": s.expected_outcomes.model_dump(exclude_unset=True)
             }
             for s in result.scenarios
         ]
@@ -43,7 +43,7 @@ interface Scenario {
     urgency: number
   }
   risks: string[]
-  expected_outcomes: Record<string, number>
+  expected_outcomes: Record<string, number | boolean>
 }
 
 interface ApprovalInfo {
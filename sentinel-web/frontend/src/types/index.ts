@@ -82,7 +82,7 @@ export interface Scenario {
   actions: ActionStep[]
   metrics: ScenarioMetrics
   risks: string[]
-  expected_outcomes: Record<string, number>
+  expected_outcomes: Record<string, number | boolean>
 }
 
 // Chat Types
@@ -296,10 +296,9 @@ class ScenarioGenerator:
                 "addresses_urgent_issues": drift.urgency_score >= 7,
                 "issue_urgency": drift.urgency_score,
             },
-            risks=[
-                f"Tax impact of ${total_tax:,.0f}" if total_tax > 0 else None,
-                "Market timing risk on delayed trades",
-            ],
+            risks=(
+                [f"Tax impact of ${total_tax:,.0f}"] if total_tax > 0 else []
+            ) + ["Market timing risk on delayed trades"],
             utility_score=None  # Will be calculated by UtilityFunction
         )
 
@@ -302,12 +302,13 @@ class OfflineDriftAnalyzer:
                     severity=severity
                 ))
 
-        # Calculate drift metrics
-        drift = PortfolioAnalytics.calculate_drift(portfolio)
+        # Calculate drift metrics (current weights computed once, not per class)
+        current_weights = PortfolioAnalytics.calculate_asset_class_weights(portfolio)
+        targets = portfolio.target_allocation.by_asset_class()
         drift_metrics = []
-        for asset_class, drift_value in drift.items():
-            target = getattr(portfolio.target_allocation, asset_class.lower().replace(" ", "_"), 0)
-            current = PortfolioAnalytics.calculate_asset_class_weights(portfolio).get(asset_class, 0)
+        for asset_class, target in targets.items():
+            current = current_weights.get(asset_class, 0)
+            drift_value = current - target
             drift_metrics.append(DriftMetric(
                 asset_class=asset_class,
                 target_weight=target,
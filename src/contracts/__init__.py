@@ -35,6 +35,7 @@ from .schemas import (
     TaxLot,
     Holding,
     TargetAllocation,
+    ASSET_CLASS_FIELDS,
     ClientProfile,
     Portfolio,
     Transaction,
@@ -53,6 +54,7 @@ from .schemas import (
     UTILITY_WEIGHTS_BY_PROFILE,
     # Coordinator / Scenarios
     ActionStep,
+    ExpectedOutcomes,
     Scenario,
     ConflictInfo,
     CoordinatorOutput,
@@ -156,6 +158,7 @@ __all__ = [
     "TaxLot",
     "Holding",
     "TargetAllocation",
+    "ASSET_CLASS_FIELDS",
     "ClientProfile",
     "Portfolio",
     "Transaction",
@@ -171,6 +174,7 @@ __all__ = [
     "UtilityScore",
     "UTILITY_WEIGHTS_BY_PROFILE",
     "ActionStep",
+    "ExpectedOutcomes",
     "Scenario",
     "ConflictInfo",
     "CoordinatorOutput",
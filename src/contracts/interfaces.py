@@ -33,6 +33,7 @@ if TYPE_CHECKING:
         SessionConfig,
         EncryptedField,
     )
+    from src.state.machine import StateTransition
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -711,8 +712,8 @@ class IStateMachine(ABC):
         pass
 
     @abstractmethod
-    def get_transition_history(self) -> list[dict]:
-        """Get history of state transitions."""
+    def get_transition_history(self) -> list[StateTransition]:
+        """Get history of state transitions (records exposing to_dict())."""
         pass
 
 
@@ -196,6 +196,17 @@ class Holding(BaseModel):
         return self.unrealized_gain_loss / self.cost_basis
 
 
+# Holding.asset_class label → TargetAllocation field
+ASSET_CLASS_FIELDS: dict[str, str] = {
+    "US Equities": "us_equities",
+    "International Equities": "international_equities",
+    "Fixed Income": "fixed_income",
+    "Alternatives": "alternatives",
+    "Structured Products": "structured_products",
+    "Cash": "cash",
+}
+
+
 class TargetAllocation(BaseModel):
     """Target allocation percentages (must sum to 1.0)"""
     us_equities: float = Field(ge=0, le=1)
@@ -220,6 +231,13 @@ class TargetAllocation(BaseModel):
             raise ValueError(f"Allocations must sum to 1.0, got {total}")
         return v
 
+    def by_asset_class(self) -> dict[str, float]:
+        """Target weight keyed by Holding.asset_class label"""
+        return {
+            label: getattr(self, name)
+            for label, name in ASSET_CLASS_FIELDS.items()
+        }
+
 
 class ClientProfile(BaseModel):
     """Client risk profile and preferences"""
@@ -385,6 +403,9 @@ class TaxAgentOutput(BaseModel):
 
 class UtilityWeights(BaseModel):
     """Weights for utility function dimensions (must sum to 1.0)"""
+    # Frozen: the presets below are shared module-level instances
+    model_config = {"frozen": True}
+
     risk_reduction: float = Field(ge=0, le=1)
     tax_savings: float = Field(ge=0, le=1)
     goal_alignment: float = Field(ge=0, le=1)
@@ -496,13 +517,58 @@ class ActionStep(BaseModel):
     rationale: str = Field(max_length=500)
 
 
+class ExpectedOutcomes(BaseModel):
+    """
+    Projected effects of a scenario, read by the utility scorers.
+
+    Fields default to the scorers' neutral values, so producers only set
+    what they know. Unknown keys are kept as extra attributes.
+    """
+    model_config = {"frozen": True, "extra": "allow"}
+
+    # Risk
+    concentration_before: float = 0
+    concentration_after: float = 0
+    diversification_delta: float = 0
+    sector_improvement: float = 0
+
+    # Tax
+    tax_impact: float = 0
+    wash_sale_violations: int = 0
+    harvest_opportunities_captured: int = 0
+    long_term_gains: float = 0
+    short_term_gains: float = 0
+
+    # Goals
+    drift_before: float = 0
+    drift_after: float = 0
+    target_alignment: float = 0.5
+    risk_profile_alignment: float = 0.5
+    income_alignment: float = 0
+    growth_alignment: float = 0
+
+    # Cost
+    transaction_costs: float = 0
+
+    # Urgency
+    urgency_level: int = 5
+    addresses_urgent_issues: bool = False
+    issue_urgency: int = 5
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style lookup kept for callers that predate the typed model."""
+        if key in type(self).model_fields:
+            return getattr(self, key)
+        return (self.model_extra or {}).get(key, default)
+
+
 class Scenario(BaseModel):
     """Complete recommendation scenario"""
     scenario_id: str
     title: str = Field(max_length=100)
     description: str = Field(max_length=1000)
     action_steps: list[ActionStep]
-    expected_outcomes: dict[str, Any]
+    expected_outcomes: ExpectedOutcomes
     risks: list[str]
     utility_score: Optional[UtilityScore] = None
 
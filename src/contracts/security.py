@@ -16,9 +16,10 @@ from __future__ import annotations
 
 from enum import Enum, Flag, auto
 from pydantic import BaseModel, Field
-from typing import Optional, TYPE_CHECKING
+from typing import Iterable, Optional, TYPE_CHECKING
 from datetime import datetime, timezone
 from functools import wraps
+import inspect
 
 if TYPE_CHECKING:
     from .interfaces import IMerkleChain
@@ -113,6 +114,19 @@ ROLE_PERMISSIONS: dict[Role, Permission] = {
     Role.ADMIN: Permission.ADMIN | Permission.CONFIGURE_SYSTEM | Permission.MANAGE_USERS | Permission.VIEW_AUDIT_LOG,
 }
 
+# Raw integer masks per role for hot permission checks, so a check is one
+# int AND instead of a Flag.__and__ (which builds a new Flag member).
+# None means unrestricted: admins hold every permission. Hot paths read
+# a Permission's int through _value_, a plain attribute, rather than the
+# slower .value property.
+#
+# Every Role has an entry (roles missing from ROLE_PERMISSIONS get 0), so
+# lookups subscript directly instead of paying for a dict.get() call.
+_ROLE_MASKS: dict[Role, Optional[int]] = {
+    role: ROLE_PERMISSIONS.get(role, Permission.NONE)._value_ for role in Role
+}
+_ROLE_MASKS[Role.ADMIN] = None
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # SESSION SECURITY
@@ -144,7 +158,9 @@ class SessionConfig(BaseModel):
     session_type: SessionType
     role: Role
     user_id: Optional[str] = None
-    allowed_portfolios: Optional[list[str]] = None  # None = all (for advisors)
+    # None = all (for advisors); lists are coerced to a frozenset so
+    # can_access_portfolio is a hash lookup
+    allowed_portfolios: Optional[frozenset[str]] = None
     sandbox_mode: bool = True
     max_tool_calls: int = Field(default=10, ge=1, le=100)
     timeout_seconds: int = Field(default=300, ge=30, le=3600)
@@ -158,17 +174,23 @@ class SessionConfig(BaseModel):
         """Get permissions for this session's role."""
         return ROLE_PERMISSIONS.get(self.role, Permission.NONE)
 
-    def has_permission(self, perm: Permission) -> bool:
-        """Check if session has a specific permission."""
-        if self.role == Role.ADMIN:
+    def has_permission(self, perm: Permission | int) -> bool:
+        """
+        Check if session has a specific permission.
+
+        perm may also be a raw int mask (a Permission's value), which lets
+        callers that check the same permission repeatedly convert it once.
+        """
+        mask = _ROLE_MASKS[self.role]
+        if mask is None:
             return True  # Admin has all permissions
-        return bool(self.permissions & perm)
+        return (mask & (perm if type(perm) is int else perm._value_)) != 0
 
     def can_access_portfolio(self, portfolio_id: str) -> bool:
         """Check if session can access a specific portfolio."""
-        if self.allowed_portfolios is None:
-            return True  # Advisor has full access
-        return portfolio_id in self.allowed_portfolios
+        allowed = self.allowed_portfolios
+        # None means full access (advisors)
+        return allowed is None or portfolio_id in allowed
 
     @property
     def requires_sandbox(self) -> bool:
@@ -182,6 +204,16 @@ class SessionConfig(BaseModel):
             return False
         return datetime.now(timezone.utc) > self.expires_at
 
+    def is_expired_at(self, now: datetime) -> bool:
+        """
+        Check expiry against a caller-supplied time.
+
+        Sweeps over many sessions read the clock once and pass it here
+        instead of paying for datetime.now() per session.
+        """
+        expires_at = self.expires_at
+        return expires_at is not None and now > expires_at
+
     def validate_access(self, portfolio_id: str, permission: Permission) -> None:
         """
         Validate session can access portfolio with permission.
@@ -220,8 +252,13 @@ def require_permission(perm: Permission):
         - self._session: SessionConfig
         - self._audit_chain: IMerkleChain (optional)
 
+    The permission's int mask is taken once here, so each call is a
+    role-mask lookup and one AND with no Flag or method-call overhead.
+
     Reference: docs/SECURITY_PRACTICES.md §2.1
     """
+    required = perm._value_
+
     def decorator(func):
         @wraps(func)
         def wrapper(self, *args, **kwargs):
@@ -232,7 +269,8 @@ def require_permission(perm: Permission):
                     f"Method {func.__name__} requires RBAC but no session configured"
                 )
 
-            if not session.has_permission(perm):
+            mask = _ROLE_MASKS[session.role]
+            if mask is not None and not (mask & required):
                 # Log denial to audit chain if available
                 audit_chain: Optional[IMerkleChain] = getattr(self, "_audit_chain", None)
                 if audit_chain:
@@ -259,8 +297,21 @@ def require_portfolio_access(func):
     """
     Decorator to enforce portfolio-level access.
 
-    The first positional argument must be portfolio_id.
+    The first positional argument must be portfolio_id. That is checked
+    once here, at decoration time, so the wrapper binds portfolio_id
+    directly with no per-call signature inspection, and a method whose
+    first argument is something else cannot be silently mis-guarded.
+
+    Raises:
+        TypeError: If func's first argument after self is not portfolio_id
     """
+    params = list(inspect.signature(func).parameters)
+    if len(params) < 2 or params[1] != "portfolio_id":
+        raise TypeError(
+            f"{func.__name__} must take portfolio_id as its first argument "
+            f"to use require_portfolio_access"
+        )
+
     @wraps(func)
     def wrapper(self, portfolio_id: str, *args, **kwargs):
         session: SessionConfig = getattr(self, "_session", None)
@@ -391,15 +442,41 @@ class SecurityContext:
     Security context for dependency injection.
 
     Provides session and audit chain to components that need them.
+
+    With access_batch_size > 1, log_access buffers access events and
+    writes them as one audit block per batch, so a burst of reads costs
+    one Merkle hash instead of one per read. Use a batched context as a
+    with-block so pending accesses are flushed when the unit of work
+    ends, even on error; denials flush pending accesses first to keep
+    the chain in order.
+
+    Usage:
+        with SecurityContext(session, chain, access_batch_size=50) as ctx:
+            for portfolio_id in portfolio_ids:
+                ctx.log_access(portfolio_id, "read")
     """
 
+    __slots__ = ("session", "audit_chain", "_access_batch_size", "_pending_accesses")
+
     def __init__(
         self,
         session: SessionConfig,
-        audit_chain: Optional["IMerkleChain"] = None
+        audit_chain: Optional["IMerkleChain"] = None,
+        access_batch_size: int = 1
     ):
+        if access_batch_size < 1:
+            raise ValueError("access_batch_size must be at least 1")
         self.session = session
         self.audit_chain = audit_chain
+        self._access_batch_size = access_batch_size
+        self._pending_accesses: list[dict] = []
+
+    def __enter__(self) -> "SecurityContext":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Flush pending accesses; exceptions still propagate."""
+        self.flush()
 
     def require_permission(self, perm: Permission) -> None:
         """Raise PermissionError if permission not held."""
@@ -419,7 +496,10 @@ class SecurityContext:
 
     def log_access(self, resource: str, action: str) -> None:
         """Log access attempt to audit chain."""
-        if self.audit_chain:
+        if not self.audit_chain:
+            return
+
+        if self._access_batch_size == 1:
             self.audit_chain.add_block({
                 "event_type": AuditEventType.ACCESS_GRANTED.value,
                 "session_id": self.session.session_id,
@@ -428,10 +508,43 @@ class SecurityContext:
                 "action": action,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             })
+            return
+
+        self._pending_accesses.append({
+            "resource": resource,
+            "action": action,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+        if len(self._pending_accesses) >= self._access_batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered access events to the audit chain as one block.
+
+        The block's resource is set when every access in the batch hit
+        the same resource, and is None for a mixed batch; the per-access
+        resources are always listed under "accesses".
+        """
+        if not self._pending_accesses or not self.audit_chain:
+            return
+
+        accesses, self._pending_accesses = self._pending_accesses, []
+        resources = {access["resource"] for access in accesses}
+        self.audit_chain.add_block({
+            "event_type": AuditEventType.ACCESS_GRANTED.value,
+            "session_id": self.session.session_id,
+            "actor": self.session.user_id or self.session.role.value,
+            "resource": resources.pop() if len(resources) == 1 else None,
+            "action": "batch_access",
+            "accesses": accesses,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
 
     def _log_denial(self, perm: Permission) -> None:
         """Log permission denial to audit chain."""
         if self.audit_chain:
+            self.flush()
             self.audit_chain.add_block({
                 "event_type": AuditEventType.PERMISSION_DENIED.value,
                 "session_id": self.session.session_id,
@@ -486,10 +599,15 @@ def create_advisor_session(
 
 def create_analyst_session(
     session_id: str,
-    allowed_portfolios: list[str],
+    allowed_portfolios: Iterable[str],
     user_id: Optional[str] = None
 ) -> SessionConfig:
-    """Create a sandboxed analyst session."""
+    """
+    Create a sandboxed analyst session.
+
+    allowed_portfolios may be any iterable of IDs (a list, or a set built
+    with | and & when composing access lists); it is stored as a frozenset.
+    """
     return SessionConfig(
         session_id=session_id,
         session_type=SessionType.ANALYST,
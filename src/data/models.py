@@ -270,23 +270,12 @@ class PortfolioAnalytics:
             Dict mapping asset class to drift percentage
         """
         current = PortfolioAnalytics.calculate_asset_class_weights(portfolio)
-        target = portfolio.target_allocation
-
-        drift = {}
-        target_dict = {
-            "US Equities": target.us_equities,
-            "International Equities": target.international_equities,
-            "Fixed Income": target.fixed_income,
-            "Alternatives": target.alternatives,
-            "Structured Products": target.structured_products,
-            "Cash": target.cash,
-        }
-
-        for asset_class, target_weight in target_dict.items():
-            current_weight = current.get(asset_class, 0)
-            drift[asset_class] = current_weight - target_weight
+        targets = portfolio.target_allocation.by_asset_class()
 
-        return drift
+        return {
+            asset_class: current.get(asset_class, 0) - target_weight
+            for asset_class, target_weight in targets.items()
+        }
 
     @staticmethod
     def find_wash_sale_risks(
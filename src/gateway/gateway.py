@@ -16,9 +16,8 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Callable, Optional, Any
+from typing import Callable, NamedTuple, Optional, Any
 from uuid import uuid4
-from dataclasses import dataclass, field
 from heapq import heappush, heappop
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -48,26 +47,25 @@ logger = logging.getLogger(__name__)
 # PRIORITY QUEUE ITEM
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass(order=True)
-class PriorityItem:
+class PriorityItem(NamedTuple):
     """
-    Wrapper for priority queue items.
+    Heap entry for priority queue items.
 
     Lower priority number = higher priority (processed first).
     Inverted from InputEvent.priority where 10 is highest.
+
+    A plain tuple so heapq compares entries with C-level tuple ordering.
+    sequence breaks ties in insertion (FIFO) order, so the event itself
+    is never compared.
     """
     priority: int
-    timestamp: float = field(compare=False)
-    event: InputEvent = field(compare=False)
+    sequence: int
+    event: InputEvent
 
     @classmethod
-    def from_event(cls, event: InputEvent) -> "PriorityItem":
+    def from_event(cls, event: InputEvent, sequence: int = 0) -> "PriorityItem":
         """Create from InputEvent with inverted priority for min-heap."""
-        return cls(
-            priority=10 - event.priority,  # Invert: 10 -> 0 (highest)
-            timestamp=event.timestamp.timestamp(),
-            event=event
-        )
+        return cls(10 - event.priority, sequence, event)  # Invert: 10 -> 0
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -93,17 +91,30 @@ class SessionQueue:
     async def put(self, event: InputEvent) -> None:
         """Add event to queue with priority ordering."""
         async with self._lock:
-            item = PriorityItem.from_event(event)
-            heappush(self._queue, item)
-            self._event_count += 1
+            self.put_nowait(event)
 
     async def get(self) -> Optional[InputEvent]:
         """Get highest priority event from queue."""
         async with self._lock:
-            if not self._queue:
-                return None
-            item = heappop(self._queue)
-            return item.event
+            return self.get_nowait()
+
+    def put_nowait(self, event: InputEvent) -> None:
+        """
+        Add event without acquiring the lock.
+
+        The heap update contains no await point, so it cannot interleave
+        with other coroutines on the same event loop.
+        """
+        item = PriorityItem.from_event(event, self._event_count)
+        heappush(self._queue, item)
+        self._event_count += 1
+
+    def get_nowait(self) -> Optional[InputEvent]:
+        """Get highest priority event without acquiring the lock."""
+        if not self._queue:
+            return None
+        item = heappop(self._queue)
+        return item.event
 
     async def peek(self) -> Optional[InputEvent]:
         """Peek at highest priority event without removing."""
@@ -232,23 +243,47 @@ class Gateway(IGateway):
             logger.warning(f"No queue exists for session {session_id}")
             return
 
-        queue = self._queues[session_id]
+        await self.drain_session(session_id)
 
-        while not queue.empty():
-            event = await queue.get()
-            if event is None:
-                break
+    async def drain_session(self, session_id: str) -> int:
+        """
+        Dequeue and process pending events for a session until it is empty.
 
-            try:
-                await self._dispatch_event(event)
-                self._events_processed += 1
-            except Exception as e:
-                logger.error(
-                    f"Error processing event {event.event_id}: {e}",
-                    exc_info=True
-                )
-                # Log error to Merkle chain
-                await self._log_event_error(event, str(e))
+        Events are popped one at a time with get_nowait(), so the per-event
+        lock is skipped but an event stays queued until it is dispatched:
+        cancelling the processing task loses nothing, and a higher-priority
+        event submitted mid-drain is picked up next. A failing event does
+        not stop the drain.
+
+        Args:
+            session_id: Session identifier (e.g., "advisor:main")
+
+        Returns:
+            Number of events processed
+        """
+        queue = self._queues.get(session_id)
+        if queue is None:
+            return 0
+
+        drained = 0
+        while (event := queue.get_nowait()) is not None:
+            await self._process_event(event)
+            drained += 1
+
+        return drained
+
+    async def _process_event(self, event: InputEvent) -> None:
+        """Dispatch a single dequeued event, logging any failure."""
+        try:
+            await self._dispatch_event(event)
+            self._events_processed += 1
+        except Exception as e:
+            logger.error(
+                f"Error processing event {event.event_id}: {e}",
+                exc_info=True
+            )
+            # Log error to Merkle chain
+            await self._log_event_error(event, str(e))
 
     def register_handler(
         self,
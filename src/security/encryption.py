@@ -18,7 +18,7 @@ from __future__ import annotations
 import os
 import secrets
 import hashlib
-from typing import Optional
+from typing import Iterable, Optional
 from datetime import datetime, timezone
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -45,6 +45,10 @@ AES_KEY_SIZE = 32  # 256 bits
 NONCE_SIZE = 12    # 96 bits (recommended for GCM)
 TAG_SIZE = 16      # 128 bits
 
+# Deepest dict nesting FieldEncryptor walks; well under the recursion
+# limit, and stops a dict that contains itself from recursing forever
+MAX_FIELD_DEPTH = 100
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # ENCRYPTION SERVICE
@@ -263,17 +267,17 @@ class FieldEncryptor:
     def __init__(
         self,
         service: EncryptionService,
-        sensitive_fields: list[str]
+        sensitive_fields: Iterable[str]
     ):
         """
         Initialize field encryptor.
 
         Args:
             service: Encryption service instance
-            sensitive_fields: List of field names to encrypt
+            sensitive_fields: Field names to encrypt (frozen for O(1) lookup)
         """
         self.service = service
-        self.sensitive_fields = set(sensitive_fields)
+        self.sensitive_fields = frozenset(sensitive_fields)
 
     def encrypt_fields(self, data: dict) -> dict:
         """
@@ -284,7 +288,21 @@ class FieldEncryptor:
 
         Returns:
             Dictionary with sensitive fields encrypted
+
+        Raises:
+            ValueError: If dicts nest deeper than MAX_FIELD_DEPTH
+                (including a dict that contains itself)
         """
+        return self._encrypt_level(data, 0)
+
+    def _encrypt_level(self, data: dict, depth: int) -> dict:
+        """Encrypt one level of nesting, recursing into nested dicts."""
+        if depth > MAX_FIELD_DEPTH:
+            raise ValueError(
+                f"Data nested deeper than {MAX_FIELD_DEPTH} levels "
+                "(reference cycle?)"
+            )
+
         result = {}
 
         for key, value in data.items():
@@ -299,7 +317,7 @@ class FieldEncryptor:
                     "key_version": encrypted.key_version
                 }
             elif isinstance(value, dict):
-                result[key] = self.encrypt_fields(value)
+                result[key] = self._encrypt_level(value, depth + 1)
             else:
                 result[key] = value
 
@@ -314,7 +332,21 @@ class FieldEncryptor:
 
         Returns:
             Dictionary with sensitive fields decrypted
+
+        Raises:
+            ValueError: If dicts nest deeper than MAX_FIELD_DEPTH
+                (including a dict that contains itself)
         """
+        return self._decrypt_level(data, 0)
+
+    def _decrypt_level(self, data: dict, depth: int) -> dict:
+        """Decrypt one level of nesting, recursing into nested dicts."""
+        if depth > MAX_FIELD_DEPTH:
+            raise ValueError(
+                f"Data nested deeper than {MAX_FIELD_DEPTH} levels "
+                "(reference cycle?)"
+            )
+
         result = {}
 
         for key, value in data.items():
@@ -329,7 +361,7 @@ class FieldEncryptor:
                     )
                     result[key] = self.service.decrypt_field(encrypted)
                 else:
-                    result[key] = self.decrypt_fields(value)
+                    result[key] = self._decrypt_level(value, depth + 1)
             else:
                 result[key] = value
 
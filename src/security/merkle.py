@@ -23,26 +23,73 @@ from __future__ import annotations
 
 import json
 import hashlib
+import os
 import uuid
+import zlib
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional, Any
+from itertools import islice
+from operator import attrgetter
+from typing import Iterator, Optional, Any
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from src.contracts.interfaces import IMerkleChain
 from src.contracts.security import AuditEvent, AuditEventType
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# HASHING
+# ═══════════════════════════════════════════════════════════════════════════
+
+# hashlib is backed by OpenSSL, which already selects the SHA-NI (x86) or
+# SHA2 crypto extension (ARMv8) compression function at runtime. Bind the
+# constructor once so the per-block path is a single C call.
+_sha256 = hashlib.sha256
+
+# Reusable encoders matching json.dumps(sort_keys=True, default=str), the
+# encoding block hashes have always been computed over
+_encode_str = json.encoder.encode_basestring_ascii
+_encode_json = json.JSONEncoder(sort_keys=True, default=str).encode
+
+
+def _encode_value(value: Any) -> str:
+    """Encode one field value exactly as json.dumps(sort_keys, default=str)."""
+    value_type = type(value)
+    if value_type is str:
+        return _encode_str(value)
+    # Scalars the block fields usually hold (index, absent resource) skip
+    # the general encoder, which costs ~2us per call to set up
+    if value is None:
+        return "null"
+    if value_type is int:
+        return int.__repr__(value)
+    return _encode_json(value)
+
+
+def _sha256_hex(payload: str) -> str:
+    """One-shot SHA-256 of a canonical block payload, as lowercase hex."""
+    return _sha256(payload.encode()).hexdigest()
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MERKLE BLOCK
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class MerkleBlock:
     """
     Single block in the Merkle chain.
 
     Immutable after creation. Hash is computed from all fields.
+    Slotted: long audit chains hold one instance per event, and slots
+    drop the per-instance __dict__.
     """
     index: int
     event_id: str
@@ -55,32 +102,60 @@ class MerkleBlock:
     data: dict
     previous_hash: str
     current_hash: str = field(default="")
+    _iso_cache: Optional[tuple[datetime, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         """Compute hash after initialization if not set."""
         if not self.current_hash:
             self.current_hash = self._compute_hash()
 
+    def _iso_timestamp(self) -> str:
+        """
+        ISO-8601 form of the timestamp.
+
+        Cached against the timestamp object itself: datetimes are
+        immutable, so the cache is valid until the attribute is replaced,
+        and a replaced timestamp is re-formatted (and so still changes
+        the hash).
+        """
+        cached = self._iso_cache
+        if cached is not None and cached[0] is self.timestamp:
+            return cached[1]
+        iso = self.timestamp.isoformat()
+        self._iso_cache = (self.timestamp, iso)
+        return iso
+
+    def _canonical_payload(self) -> str:
+        """
+        Build the canonical JSON payload that is hashed.
+
+        Byte-identical to json.dumps of the hashed fields with
+        sort_keys=True (so persisted chains keep verifying), specialized
+        to this fixed schema: keys are written pre-sorted in a single
+        f-string instead of building and re-sorting a dict per block.
+        """
+        return (
+            f'{{"action": {_encode_value(self.action)}, '
+            f'"actor": {_encode_value(self.actor)}, '
+            f'"data": {_encode_json(self.data)}, '
+            f'"event_id": {_encode_value(self.event_id)}, '
+            f'"event_type": {_encode_value(self.event_type)}, '
+            f'"index": {_encode_value(self.index)}, '
+            f'"previous_hash": {_encode_value(self.previous_hash)}, '
+            f'"resource": {_encode_value(self.resource)}, '
+            f'"session_id": {_encode_value(self.session_id)}, '
+            f'"timestamp": {_encode_str(self._iso_timestamp())}}}'
+        )
+
     def _compute_hash(self) -> str:
         """
         Compute SHA-256 hash of block contents.
 
         Hash includes all fields except current_hash itself.
         """
-        content = {
-            "index": self.index,
-            "event_id": self.event_id,
-            "timestamp": self.timestamp.isoformat(),
-            "event_type": self.event_type,
-            "session_id": self.session_id,
-            "actor": self.actor,
-            "action": self.action,
-            "resource": self.resource,
-            "data": self.data,
-            "previous_hash": self.previous_hash
-        }
-        content_str = json.dumps(content, sort_keys=True, default=str)
-        return hashlib.sha256(content_str.encode()).hexdigest()
+        return _sha256_hex(self._canonical_payload())
 
     def verify(self) -> bool:
         """Verify block hash is valid."""
@@ -91,7 +166,7 @@ class MerkleBlock:
         return {
             "index": self.index,
             "event_id": self.event_id,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self._iso_timestamp(),
             "event_type": self.event_type,
             "session_id": self.session_id,
             "actor": self.actor,
@@ -135,6 +210,60 @@ class MerkleBlock:
         )
 
 
+def _json_loads(raw: bytes) -> Any:
+    """
+    Parse persisted chain JSON, using orjson when it is installed.
+
+    Falls back to the stdlib parser for input orjson rejects but json.dump
+    can emit (NaN/Infinity, integers wider than 64 bits).
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+# Snapshot trailer holding a CRC-32 of the JSON body. It is checked before
+# parsing so a corrupted file fails fast; CRC only catches accidental
+# corruption, so loads still run full hash verification.
+_CHECKSUM_MARKER = b"\n#crc32:"
+
+
+def _add_checksum(body: bytes) -> bytes:
+    """Append the CRC-32 trailer to a serialized snapshot."""
+    return body + _CHECKSUM_MARKER + b"%08x\n" % zlib.crc32(body)
+
+
+def _split_checksum(raw: bytes) -> tuple[bytes, Optional[bool]]:
+    """
+    Split a snapshot into its JSON body and checksum result.
+
+    Returns:
+        (body, matched) where matched is None for files written before
+        the trailer existed
+    """
+    marker = raw.rfind(_CHECKSUM_MARKER)
+    if marker == -1:
+        return raw, None
+    body = raw[:marker]
+    try:
+        stored = int(raw[marker + len(_CHECKSUM_MARKER):], 16)
+    except ValueError:
+        return body, False
+    return body, stored == zlib.crc32(body)
+
+
+def _log_path_for(path: Path) -> Path:
+    """Path of the append-only log that accompanies a snapshot."""
+    return path.with_name(path.name + ".log")
+
+
+_get_previous_hash = attrgetter("previous_hash")
+_get_current_hash = attrgetter("current_hash")
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # MERKLE CHAIN
 # ═══════════════════════════════════════════════════════════════════════════
@@ -172,11 +301,21 @@ class MerkleChain(IMerkleChain):
 
         Args:
             persistence_path: Path to persist chain (optional)
-            auto_persist: If True, persist after each block addition
+            auto_persist: If True, persist after each block addition.
+                After the first snapshot, new blocks are appended to a
+                sidecar log (see log_path) instead of rewriting the file.
         """
         self._blocks: list[MerkleBlock] = []
+        self._hash_index: dict[str, int] = {}
+        self._session_index: defaultdict[str, list[MerkleBlock]] = defaultdict(list)
+        self._event_type_index: defaultdict[str, list[MerkleBlock]] = defaultdict(list)
         self._persistence_path = persistence_path
         self._auto_persist = auto_persist
+        self._snapshot_written = False
+        # Byte offset of a partial trailing log record found on load
+        self._log_truncate_at: Optional[int] = None
+        # (index, hash) of the last block covered by a successful verify
+        self._checkpoint: Optional[tuple[int, str]] = None
 
         # Create genesis block
         self._create_genesis_block()
@@ -199,7 +338,24 @@ class MerkleChain(IMerkleChain):
             data={"version": "1.0"},
             previous_hash=self.GENESIS_HASH
         )
-        self._blocks.append(genesis)
+        self._append_block(genesis)
+
+    def _append_block(self, block: MerkleBlock) -> None:
+        """Append a block and add it to the lookup indexes."""
+        self._hash_index[block.current_hash] = len(self._blocks)
+        self._session_index[block.session_id].append(block)
+        self._event_type_index[block.event_type].append(block)
+        self._blocks.append(block)
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the lookup indexes from the current block list."""
+        blocks = self._blocks
+        self._blocks = []
+        self._hash_index = {}
+        self._session_index = defaultdict(list)
+        self._event_type_index = defaultdict(list)
+        for block in blocks:
+            self._append_block(block)
 
     def add_block(self, data: dict) -> str:
         """
@@ -250,15 +406,19 @@ class MerkleChain(IMerkleChain):
             previous_hash=previous_hash
         )
 
-        self._blocks.append(block)
+        self._append_block(block)
 
-        # Auto-persist if configured
+        # Auto-persist if configured: append to the log once a snapshot
+        # exists, so each block costs O(1) I/O instead of a full rewrite
         if self._auto_persist and self._persistence_path:
-            self._persist_to_disk()
+            if self._snapshot_written:
+                self._append_to_log(block)
+            else:
+                self._persist_to_disk()
 
         return block.current_hash
 
-    def verify_integrity(self) -> bool:
+    def verify_integrity(self, incremental: bool = False) -> bool:
         """
         Verify entire chain integrity.
 
@@ -267,29 +427,59 @@ class MerkleChain(IMerkleChain):
         2. Each block's previous_hash matches prior block
         3. Genesis block hash is correct
 
+        Args:
+            incremental: If True, trust the blocks covered by the last
+                successful verification (the checkpoint) and only verify
+                blocks appended since. The checkpoint block's hash is
+                re-checked, but in-memory edits to earlier blocks are not
+                detected; keep the default full pass for audits.
+
         Returns:
             True if chain is valid, False if tampered
         """
-        if not self._blocks:
+        blocks = self._blocks
+        if not blocks:
             return False
 
-        # Verify genesis block
-        if self._blocks[0].previous_hash != self.GENESIS_HASH:
-            return False
+        start = self._checkpoint_index() if incremental else 0
 
-        # Verify each block
-        for i, block in enumerate(self._blocks):
-            # Verify block's own hash
-            if not block.verify():
-                return False
+        # Verify linkage first: string compares are far cheaper than
+        # rehashing, so a broken link fails before any SHA-256 work
+        if not self._verify_linkage(start):
+            return False
 
-            # Verify chain linkage (except genesis)
-            if i > 0:
-                if block.previous_hash != self._blocks[i - 1].current_hash:
-                    return False
+        # Verify each block's own hash; map/all keep the loop in C and stop
+        # at the first failure. The checkpoint block was already verified.
+        if not all(map(MerkleBlock.verify, islice(blocks, start + 1 if start else 0, None))):
+            return False
 
+        self._checkpoint = (len(blocks) - 1, blocks[-1].current_hash)
         return True
 
+    def _checkpoint_index(self) -> int:
+        """Index of the last verified block, or 0 if it can't be trusted."""
+        if self._checkpoint is None:
+            return 0
+        index, hash = self._checkpoint
+        if index < len(self._blocks) and self._blocks[index].current_hash == hash:
+            return index
+        return 0
+
+    def _verify_linkage(self, start: int = 0) -> bool:
+        """Check the genesis link and every previous_hash -> current_hash link."""
+        blocks = self._blocks[start:] if start else self._blocks
+
+        # Gather the hash columns once; linkage then reduces to comparing
+        # two lists, which runs as a single C-level pass
+        previous_hashes = list(map(_get_previous_hash, blocks))
+        current_hashes = list(map(_get_current_hash, blocks))
+
+        # Verify genesis block
+        if not start and previous_hashes[0] != self.GENESIS_HASH:
+            return False
+
+        return previous_hashes[1:] == current_hashes[:-1]
+
     def get_root_hash(self) -> str:
         """
         Get the current chain root (latest block hash).
@@ -309,19 +499,21 @@ class MerkleChain(IMerkleChain):
 
     def get_block_by_hash(self, hash: str) -> Optional[MerkleBlock]:
         """Get block by hash."""
-        for block in self._blocks:
-            if block.current_hash == hash:
-                return block
-        return None
+        index = self._hash_index.get(hash)
+        if index is None:
+            return None
+        block = self._blocks[index]
+        # Guard against a block whose hash no longer matches its index entry
+        return block if block.current_hash == hash else None
 
     def get_blocks_by_session(self, session_id: str) -> list[MerkleBlock]:
         """Get all blocks for a session."""
-        return [b for b in self._blocks if b.session_id == session_id]
+        return list(self._session_index.get(session_id, ()))
 
     def get_blocks_by_event_type(self, event_type: AuditEventType) -> list[MerkleBlock]:
         """Get all blocks of a specific event type."""
         event_type_str = event_type.value if isinstance(event_type, AuditEventType) else event_type
-        return [b for b in self._blocks if b.event_type == event_type_str]
+        return list(self._event_type_index.get(event_type_str, ()))
 
     def get_blocks_in_range(
         self,
@@ -345,8 +537,15 @@ class MerkleChain(IMerkleChain):
 
     # ─── Persistence ──────────────────────────────────────────────────────────
 
+    @property
+    def log_path(self) -> Optional[Path]:
+        """Append-only log of blocks added since the last snapshot."""
+        if not self._persistence_path:
+            return None
+        return _log_path_for(self._persistence_path)
+
     def _persist_to_disk(self) -> None:
-        """Save chain to disk."""
+        """Save a full snapshot to disk and truncate the append log."""
         if not self._persistence_path:
             return
 
@@ -359,11 +558,87 @@ class MerkleChain(IMerkleChain):
             "blocks": [b.to_dict() for b in self._blocks]
         }
 
-        with open(self._persistence_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        # Compact output keeps stdlib json on its C encoder (indent forces
+        # the pure-Python one). Writing stays on stdlib json because the
+        # block hash is defined over its encoding: orjson would persist
+        # NaN as null and datetimes in a different format.
+        body = json.dumps(data, default=str).encode()
+
+        # Write beside the snapshot and rename over it, so a crash leaves
+        # either the old or the new snapshot, never a torn one
+        tmp_path = self._persistence_path.with_name(self._persistence_path.name + ".tmp")
+        tmp_path.write_bytes(_add_checksum(body))
+        os.replace(tmp_path, self._persistence_path)
+
+        # Every logged block is now in the snapshot. A crash before this
+        # unlink leaves records the snapshot already covers; loading skips
+        # them by index.
+        self.log_path.unlink(missing_ok=True)
+        self._log_truncate_at = None
+        self._snapshot_written = True
+
+    def _append_to_log(self, block: MerkleBlock) -> None:
+        """
+        Append a single block to the log as one JSON line.
+
+        If loading found a partial trailing record, it is truncated away
+        first so this record starts on a fresh line.
+        """
+        if self._log_truncate_at is not None:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(self._log_truncate_at)
+            self._log_truncate_at = None
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(block.to_dict(), default=str) + "\n")
+
+    def _read_log(self, start: int) -> list[MerkleBlock]:
+        """
+        Read blocks appended since the last snapshot.
+
+        The log is only read, never modified. A trailing record without a
+        newline was interrupted mid-write and was never acknowledged to
+        the caller; it is skipped, and its offset is kept so the next
+        append truncates it (see _append_to_log).
+
+        Args:
+            start: Block count of the snapshot. Records with a lower index
+                are already in it (left behind by a crash between writing
+                a snapshot and removing the log) and are skipped.
+        """
+        log_path = self.log_path
+        if not log_path.exists():
+            return []
+
+        raw = log_path.read_bytes()
+        records = raw.split(b"\n")
+        # The last element is empty for a complete log, partial otherwise
+        partial = records[-1]
+        if partial:
+            self._log_truncate_at = len(raw) - len(partial)
+
+        blocks = []
+        for record in records[:-1]:
+            d = _json_loads(record)
+            if d["index"] >= start:
+                blocks.append(MerkleBlock.from_dict(d))
+        return blocks
+
+    def _share_link_hashes(self) -> None:
+        """
+        Point each loaded block's previous_hash at its predecessor's hash.
+
+        Blocks built by add_block already share one string per link;
+        loaded blocks get separate copies from the parser. Sharing halves
+        hash memory and lets later linkage checks hit the identity fast
+        path instead of comparing 64 characters.
+        """
+        blocks = self._blocks
+        for prev, block in zip(blocks, islice(blocks, 1, None)):
+            if block.previous_hash == prev.current_hash:
+                block.previous_hash = prev.current_hash
 
     def _load_from_disk(self) -> None:
-        """Load chain from disk."""
+        """Load the snapshot from disk and replay the append log."""
         if not self._persistence_path or not self._persistence_path.exists():
             return
 
@@ -371,11 +646,22 @@ class MerkleChain(IMerkleChain):
         if self._persistence_path.stat().st_size == 0:
             return
 
-        with open(self._persistence_path, "r") as f:
-            data = json.load(f)
+        # Reject corrupted snapshots before parsing or hashing anything
+        body, checksum_ok = _split_checksum(self._persistence_path.read_bytes())
+        if checksum_ok is False:
+            raise ValueError(
+                f"Merkle chain at {self._persistence_path} failed integrity check. "
+                "Snapshot checksum does not match its contents."
+            )
+
+        data = _json_loads(body)
 
         # Clear current blocks and load from file
         self._blocks = [MerkleBlock.from_dict(b) for b in data["blocks"]]
+        self._blocks.extend(self._read_log(len(self._blocks)))
+        self._share_link_hashes()
+        self._rebuild_indexes()
+        self._snapshot_written = True
 
         # Verify loaded chain
         if not self.verify_integrity():
@@ -385,16 +671,26 @@ class MerkleChain(IMerkleChain):
             )
 
     def persist(self) -> None:
-        """Manually persist chain to disk."""
+        """Manually persist a full snapshot to disk (truncates the log)."""
         self._persist_to_disk()
 
     def export_chain(self) -> list[dict]:
         """Export chain as list of dictionaries."""
         return [b.to_dict() for b in self._blocks]
 
+    def iter_audit_events(self) -> Iterator[AuditEvent]:
+        """
+        Stream the chain as AuditEvent models, one block at a time.
+
+        Prefer this over export_audit_events for long chains: only one
+        model is alive at a time unless the caller keeps them.
+        """
+        for block in islice(self._blocks, 1, None):  # Skip genesis
+            yield block.to_audit_event()
+
     def export_audit_events(self) -> list[AuditEvent]:
         """Export chain as AuditEvent models."""
-        return [b.to_audit_event() for b in self._blocks[1:]]  # Skip genesis
+        return list(self.iter_audit_events())
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -426,18 +722,30 @@ def get_persistent_chain(path: Path, auto_persist: bool = True) -> MerkleChain:
     return MerkleChain(persistence_path=path, auto_persist=auto_persist)
 
 
-def verify_chain_file(path: Path) -> bool:
+def verify_chain_file(path: Path, quick: bool = False) -> bool:
     """
     Verify integrity of a persisted chain file.
 
+    Blocks in the file's append log (see MerkleChain.log_path) are
+    verified together with the snapshot.
+
     Args:
         path: Path to chain file
+        quick: If True, only compare the snapshot's CRC-32 trailer. This
+            detects corruption but not deliberate tampering (the CRC can
+            be recomputed). Falls back to full verification when the
+            snapshot has no trailer or an append log exists.
 
     Returns:
         True if chain is valid
     """
     try:
-        chain = MerkleChain(persistence_path=path)
-        return chain.verify_integrity()
+        if quick and not _log_path_for(path).exists():
+            _, checksum_ok = _split_checksum(path.read_bytes())
+            if checksum_ok is not None:
+                return checksum_ok
+        # Loading runs the full verification
+        MerkleChain(persistence_path=path)
+        return True
     except Exception:
         return False
@@ -11,8 +11,9 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Callable, TypeVar, ParamSpec
-from functools import wraps
+from typing import Optional, Callable, Iterable, TypeVar, ParamSpec
+from functools import reduce, wraps
+from operator import or_
 from dataclasses import dataclass, field
 
 from src.contracts.interfaces import IMerkleChain, ISecurityEnforcer
@@ -25,6 +26,7 @@ from src.contracts.security import (
     SecurityContext,
     ROLE_PERMISSIONS,
     SANDBOXED_SESSIONS,
+    _ROLE_MASKS,
     create_advisor_session,
     create_analyst_session,
     create_agent_session,
@@ -116,7 +118,7 @@ class RBACService(ISecurityEnforcer):
             self._log_decision(session, required, False, "Session expired")
             return False
 
-        # Check permission
+        # Check permission against the session's current role mask
         has_perm = session.has_permission(required)
 
         # Log decision
@@ -234,9 +236,10 @@ class RBACService(ISecurityEnforcer):
         Returns:
             Number of sessions removed
         """
+        now = datetime.now(timezone.utc)
         expired = [
             sid for sid, session in self._sessions.items()
-            if session.is_expired
+            if session.is_expired_at(now)
         ]
         for sid in expired:
             self.terminate_session(sid, reason="expired")
@@ -293,7 +296,7 @@ class RBACService(ISecurityEnforcer):
     def create_analyst_session(
         self,
         session_id: str,
-        allowed_portfolios: list[str],
+        allowed_portfolios: Iterable[str],
         user_id: Optional[str] = None
     ) -> SessionConfig:
         """
@@ -301,7 +304,7 @@ class RBACService(ISecurityEnforcer):
 
         Args:
             session_id: Session identifier
-            allowed_portfolios: List of accessible portfolio IDs
+            allowed_portfolios: Accessible portfolio IDs (any iterable)
             user_id: Optional user ID
 
         Returns:
@@ -379,6 +382,7 @@ class RBACService(ISecurityEnforcer):
 
     def get_active_sessions(self) -> list[dict]:
         """Get list of all active sessions."""
+        now = datetime.now(timezone.utc)
         return [
             {
                 "session_id": session.session_id,
@@ -390,12 +394,13 @@ class RBACService(ISecurityEnforcer):
                 "expires_at": session.expires_at.isoformat() if session.expires_at else None,
             }
             for session in self._sessions.values()
-            if not session.is_expired
+            if not session.is_expired_at(now)
         ]
 
     def get_session_count(self) -> int:
         """Get count of active sessions."""
-        return len([s for s in self._sessions.values() if not s.is_expired])
+        now = datetime.now(timezone.utc)
+        return sum(1 for s in self._sessions.values() if not s.is_expired_at(now))
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -433,7 +438,15 @@ def require_permissions(*permissions: Permission):
         @require_permissions(Permission.READ_HOLDINGS, Permission.READ_TAX_LOTS)
         def get_tax_data(self, portfolio_id: str):
             ...
+
+    The permissions are OR-ed into one mask when the decorator is applied,
+    so each call is a single AND against the session's role mask.
     """
+    required = reduce(or_, (perm._value_ for perm in permissions), 0)
+    if any(perm._value_ == 0 for perm in permissions):
+        # Permission.NONE is never held by a non-admin role
+        required = -1
+
     def decorator(func: Callable[P, T]) -> Callable[P, T]:
         @wraps(func)
         def wrapper(self, *args: P.args, **kwargs: P.kwargs) -> T:
@@ -444,12 +457,15 @@ def require_permissions(*permissions: Permission):
                     f"Method {func.__name__} requires RBAC but no session configured"
                 )
 
-            for perm in permissions:
-                if not session.has_permission(perm):
-                    raise PermissionError(
-                        f"Permission {perm.name} required for {func.__name__}. "
-                        f"Session {session.session_id} has role {session.role.value}"
-                    )
+            mask = _ROLE_MASKS[session.role]
+            if mask is not None and (mask & required) != required:
+                # Slow path: name the first missing permission
+                for perm in permissions:
+                    if not session.has_permission(perm):
+                        raise PermissionError(
+                            f"Permission {perm.name} required for {func.__name__}. "
+                            f"Session {session.session_id} has role {session.role.value}"
+                        )
 
             return func(self, *args, **kwargs)
         return wrapper
@@ -12,8 +12,10 @@ from __future__ import annotations
 import logging
 import uuid
 import asyncio
+from collections import Counter
+from itertools import count
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Callable, Any, TypeVar, Generic
+from typing import Optional, Callable, Any, Iterable, Iterator, TypeVar, Generic
 from dataclasses import dataclass, field
 from contextlib import contextmanager, asynccontextmanager
 from abc import ABC, abstractmethod
@@ -39,15 +41,34 @@ T = TypeVar("T")
 # SESSION LIFECYCLE
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class SessionMetrics:
-    """Metrics collected during session lifecycle."""
+    """Metrics collected during session lifecycle (slotted: one per session)."""
     tool_calls: int = 0
     permission_checks: int = 0
     permission_denials: int = 0
     portfolio_accesses: int = 0
     start_time: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     end_time: Optional[datetime] = None
+    _tool_call_seq: Iterator[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Continue numbering after any tool_calls passed in
+        self._tool_call_seq = count(self.tool_calls + 1)
+
+    def next_tool_call(self) -> int:
+        """
+        Count a tool call and return its 1-based sequence number.
+
+        next() on an itertools.count is atomic under the GIL, so concurrent
+        callers each get a distinct number without taking a lock, unlike
+        a read-modify-write on tool_calls. Limits are enforced on the
+        returned number; tool_calls is the high-water mark for reporting.
+        """
+        calls = next(self._tool_call_seq)
+        if calls > self.tool_calls:
+            self.tool_calls = calls
+        return calls
 
     @property
     def duration_seconds(self) -> float:
@@ -99,6 +120,10 @@ class SessionManager:
         self._default_timeout = default_timeout_seconds
         self._cleanup_interval = cleanup_interval_seconds
 
+        # Lock-free store: single get/set/pop calls on a dict are atomic
+        # under the GIL, so create/get/terminate never contend on a lock.
+        # Anything that iterates works on a copy() so concurrent lifecycle
+        # calls cannot break the iteration.
         self._sessions: dict[str, SessionConfig] = {}
         self._metrics: dict[str, SessionMetrics] = {}
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -112,7 +137,7 @@ class SessionManager:
         session_type: SessionType,
         role: Role,
         user_id: Optional[str] = None,
-        allowed_portfolios: Optional[list[str]] = None,
+        allowed_portfolios: Optional[Iterable[str]] = None,
         timeout_seconds: Optional[int] = None,
         max_tool_calls: int = 100,
     ) -> SessionConfig:
@@ -123,7 +148,7 @@ class SessionManager:
             session_type: Type of session (advisor, analyst, client)
             role: Role for RBAC
             user_id: Optional user identifier
-            allowed_portfolios: List of accessible portfolios (None = all)
+            allowed_portfolios: Accessible portfolio IDs (None = all)
             timeout_seconds: Session timeout (None = default)
             max_tool_calls: Maximum tool calls allowed
 
@@ -225,6 +250,8 @@ class SessionManager:
     def _expire_session(self, session_id: str) -> None:
         """Handle session expiration."""
         session = self._sessions.pop(session_id, None)
+        if session is None:
+            return  # Already expired or terminated by another caller
         metrics = self._metrics.pop(session_id, None)
 
         if metrics:
@@ -261,12 +288,12 @@ class SessionManager:
 
         metrics = self._metrics.get(session_id)
         if metrics:
-            metrics.tool_calls += 1
+            calls = metrics.next_tool_call()
 
-            if metrics.tool_calls > session.max_tool_calls:
+            if calls > session.max_tool_calls:
                 logger.warning(
                     f"Session {session_id} exceeded tool call limit "
-                    f"({metrics.tool_calls}/{session.max_tool_calls})"
+                    f"({calls}/{session.max_tool_calls})"
                 )
                 return False
 
@@ -406,9 +433,10 @@ class SessionManager:
         Returns:
             Number of sessions cleaned up
         """
+        now = datetime.now(timezone.utc)
         expired = [
-            sid for sid, session in self._sessions.items()
-            if session.is_expired
+            sid for sid, session in self._sessions.copy().items()
+            if session.is_expired_at(now)
         ]
         for sid in expired:
             self._expire_session(sid)
@@ -445,26 +473,38 @@ class SessionManager:
 
     def get_stats(self) -> dict:
         """Get session manager statistics."""
-        active_sessions = [s for s in self._sessions.values() if not s.is_expired]
+        sessions = self._sessions.copy()
+        now = datetime.now(timezone.utc)
+
+        # One pass over the table, tallying every breakdown at once
+        by_type: Counter[SessionType] = Counter()
+        by_role: Counter[Role] = Counter()
+        active = sandboxed = 0
+        for s in sessions.values():
+            if s.is_expired_at(now):
+                continue
+            active += 1
+            by_type[s.session_type] += 1
+            by_role[s.role] += 1
+            sandboxed += s.sandbox_mode
 
         return {
-            "total_sessions": len(self._sessions),
-            "active_sessions": len(active_sessions),
-            "sessions_by_type": {
-                st.value: len([s for s in active_sessions if s.session_type == st])
-                for st in SessionType
-            },
-            "sessions_by_role": {
-                r.value: len([s for s in active_sessions if s.role == r])
-                for r in Role
-            },
-            "sandboxed_sessions": len([s for s in active_sessions if s.sandbox_mode]),
+            "total_sessions": len(sessions),
+            "active_sessions": active,
+            "sessions_by_type": {st.value: by_type[st] for st in SessionType},
+            "sessions_by_role": {r.value: by_role[r] for r in Role},
+            "sandboxed_sessions": sandboxed,
         }
 
     def list_sessions(self) -> list[dict]:
         """List all active sessions with details."""
-        return [
-            {
+        now = datetime.now(timezone.utc)
+        result = []
+        for session in self._sessions.copy().values():
+            if session.is_expired_at(now):
+                continue
+            metrics = self._metrics.get(session.session_id)
+            result.append({
                 "session_id": session.session_id,
                 "session_type": session.session_type.value,
                 "role": session.role.value,
@@ -472,12 +512,9 @@ class SessionManager:
                 "sandbox_mode": session.sandbox_mode,
                 "created_at": session.created_at.isoformat() if session.created_at else None,
                 "expires_at": session.expires_at.isoformat() if session.expires_at else None,
-                "metrics": self._metrics.get(session.session_id).to_dict()
-                if session.session_id in self._metrics else None,
-            }
-            for session in self._sessions.values()
-            if not session.is_expired
-        ]
+                "metrics": metrics.to_dict() if metrics else None,
+            })
+        return result
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -521,9 +558,14 @@ class LocalSandbox(ISandbox):
         logger.debug(f"LocalSandbox executing for session {session.session_id}")
 
         # In local mode, we just run the code directly
-        # A real implementation would use subprocess or Docker
+        # A real implementation would use subprocess or Docker.
+        # Call first and await only if the result is awaitable: a plain
+        # attribute probe is far cheaper than asyncio.iscoroutinefunction,
+        # and it also covers lambdas/partials that return coroutines.
         try:
-            result = code() if not asyncio.iscoroutinefunction(code) else await code()
+            result = code()
+            if hasattr(result, "__await__"):
+                result = await result
             return {
                 "status": "success",
                 "result": result,
@@ -16,6 +16,7 @@ from src.state.utility import (
     UtilityFunction,
     UtilityFunctionFactory,
     ScoringConfig,
+    Ranking,
     score_and_rank,
 )
 
@@ -29,5 +30,6 @@ __all__ = [
     "UtilityFunction",
     "UtilityFunctionFactory",
     "ScoringConfig",
+    "Ranking",
     "score_and_rank",
 ]
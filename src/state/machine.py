@@ -15,10 +15,8 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timezone
 from typing import Optional, Callable, Any
-from dataclasses import dataclass, field
-
-from transitions import Machine
-from transitions.core import EventData
+from collections import deque
+from dataclasses import dataclass, field, replace
 
 from src.contracts.interfaces import IStateMachine, IMerkleChain
 from src.contracts.schemas import SystemState
@@ -26,14 +24,18 @@ from src.contracts.security import AuditEventType
 
 logger = logging.getLogger(__name__)
 
+# Transitions kept in memory per machine; older records remain in the
+# Merkle chain but drop out of get_transition_history()
+DEFAULT_HISTORY_LIMIT = 10_000
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # STATE TRANSITION RECORD
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class StateTransition:
-    """Record of a state transition."""
+    """Record of a state transition (immutable once recorded)."""
     from_state: str
     to_state: str
     trigger: str
@@ -54,6 +56,58 @@ class StateTransition:
         }
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# TRANSITION TABLE
+# ═══════════════════════════════════════════════════════════════════════════
+
+_STATES: list[str] = [
+    SystemState.MONITOR.value,
+    SystemState.DETECT.value,
+    SystemState.ANALYZE.value,
+    SystemState.CONFLICT_RESOLUTION.value,
+    SystemState.RECOMMEND.value,
+    SystemState.APPROVED.value,
+    SystemState.EXECUTE.value,
+]
+
+_TRANSITIONS: list[dict[str, str]] = [
+    # Normal flow
+    {"trigger": "detect_event", "source": SystemState.MONITOR.value, "dest": SystemState.DETECT.value},
+    {"trigger": "start_analysis", "source": SystemState.DETECT.value, "dest": SystemState.ANALYZE.value},
+    {"trigger": "detect_conflict", "source": SystemState.ANALYZE.value, "dest": SystemState.CONFLICT_RESOLUTION.value},
+    {"trigger": "no_conflict", "source": SystemState.ANALYZE.value, "dest": SystemState.RECOMMEND.value},
+    {"trigger": "resolve_conflict", "source": SystemState.CONFLICT_RESOLUTION.value, "dest": SystemState.RECOMMEND.value},
+    {"trigger": "approve", "source": SystemState.RECOMMEND.value, "dest": SystemState.APPROVED.value},
+    {"trigger": "execute", "source": SystemState.APPROVED.value, "dest": SystemState.EXECUTE.value},
+    {"trigger": "complete", "source": SystemState.EXECUTE.value, "dest": SystemState.MONITOR.value},
+
+    # Reset/abort paths
+    {"trigger": "reset", "source": SystemState.DETECT.value, "dest": SystemState.MONITOR.value},
+    {"trigger": "reset", "source": SystemState.ANALYZE.value, "dest": SystemState.MONITOR.value},
+    {"trigger": "reset", "source": SystemState.CONFLICT_RESOLUTION.value, "dest": SystemState.MONITOR.value},
+    {"trigger": "reject", "source": SystemState.RECOMMEND.value, "dest": SystemState.MONITOR.value},
+    {"trigger": "abort", "source": SystemState.APPROVED.value, "dest": SystemState.MONITOR.value},
+    {"trigger": "abort", "source": SystemState.EXECUTE.value, "dest": SystemState.MONITOR.value},
+]
+
+# (source, trigger) → dest: one dict lookup per fired trigger
+_NEXT_STATE: dict[tuple[str, str], str] = {
+    (t["source"], t["trigger"]): t["dest"] for t in _TRANSITIONS
+}
+
+# (source, dest) → trigger, keeping the first listed trigger for an edge
+_TRIGGER_FOR_EDGE: dict[tuple[str, str], str] = {}
+for _t in _TRANSITIONS:
+    _TRIGGER_FOR_EDGE.setdefault((_t["source"], _t["dest"]), _t["trigger"])
+del _t
+
+# state → triggers valid from it, in table order
+_AVAILABLE_TRIGGERS: dict[str, tuple[str, ...]] = {
+    state: tuple(t["trigger"] for t in _TRANSITIONS if t["source"] == state)
+    for state in _STATES
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # STATE MACHINE
 # ═══════════════════════════════════════════════════════════════════════════
@@ -71,43 +125,17 @@ class SentinelStateMachine(IStateMachine):
     All transitions are logged to the Merkle chain for audit compliance.
     """
 
-    # Define valid states
-    STATES = [
-        SystemState.MONITOR.value,
-        SystemState.DETECT.value,
-        SystemState.ANALYZE.value,
-        SystemState.CONFLICT_RESOLUTION.value,
-        SystemState.RECOMMEND.value,
-        SystemState.APPROVED.value,
-        SystemState.EXECUTE.value,
-    ]
-
-    # Define valid transitions
-    TRANSITIONS = [
-        # Normal flow
-        {"trigger": "detect_event", "source": SystemState.MONITOR.value, "dest": SystemState.DETECT.value},
-        {"trigger": "start_analysis", "source": SystemState.DETECT.value, "dest": SystemState.ANALYZE.value},
-        {"trigger": "detect_conflict", "source": SystemState.ANALYZE.value, "dest": SystemState.CONFLICT_RESOLUTION.value},
-        {"trigger": "no_conflict", "source": SystemState.ANALYZE.value, "dest": SystemState.RECOMMEND.value},
-        {"trigger": "resolve_conflict", "source": SystemState.CONFLICT_RESOLUTION.value, "dest": SystemState.RECOMMEND.value},
-        {"trigger": "approve", "source": SystemState.RECOMMEND.value, "dest": SystemState.APPROVED.value},
-        {"trigger": "execute", "source": SystemState.APPROVED.value, "dest": SystemState.EXECUTE.value},
-        {"trigger": "complete", "source": SystemState.EXECUTE.value, "dest": SystemState.MONITOR.value},
-
-        # Reset/abort paths
-        {"trigger": "reset", "source": SystemState.DETECT.value, "dest": SystemState.MONITOR.value},
-        {"trigger": "reset", "source": SystemState.ANALYZE.value, "dest": SystemState.MONITOR.value},
-        {"trigger": "reset", "source": SystemState.CONFLICT_RESOLUTION.value, "dest": SystemState.MONITOR.value},
-        {"trigger": "reject", "source": SystemState.RECOMMEND.value, "dest": SystemState.MONITOR.value},
-        {"trigger": "abort", "source": SystemState.APPROVED.value, "dest": SystemState.MONITOR.value},
-        {"trigger": "abort", "source": SystemState.EXECUTE.value, "dest": SystemState.MONITOR.value},
-    ]
+    # Valid states and transitions (see the module-level table)
+    STATES = _STATES
+    TRANSITIONS = _TRANSITIONS
 
     def __init__(
         self,
         session_id: str,
         merkle_chain: Optional[IMerkleChain] = None,
         initial_state: str = SystemState.MONITOR.value,
+        history_limit: int = DEFAULT_HISTORY_LIMIT,
+        log_initial: bool = True,
     ):
         """
         Initialize state machine.
@@ -116,26 +144,25 @@ class SentinelStateMachine(IStateMachine):
             session_id: Session identifier for audit logging
             merkle_chain: Optional Merkle chain for audit trail
             initial_state: Starting state (default: MONITOR)
+            history_limit: Most recent transitions kept in memory
+            log_initial: Write an "initialize" block to the Merkle chain
+
+        Raises:
+            ValueError: If initial_state is not a known state
         """
         self.session_id = session_id
         self._merkle_chain = merkle_chain
-        self._history: list[StateTransition] = []
+        self._history: deque[StateTransition] = deque(maxlen=history_limit)
         self._callbacks: dict[str, list[Callable]] = {}
+        self._pending_metadata: dict = {}
 
-        # Initialize the transitions Machine
-        self._machine = Machine(
-            model=self,
-            states=self.STATES,
-            transitions=self.TRANSITIONS,
-            initial=initial_state,
-            auto_transitions=False,
-            send_event=True,  # Pass EventData to callbacks
-            before_state_change=self._before_transition,
-            after_state_change=self._after_transition,
-        )
+        if initial_state not in _STATES:
+            raise ValueError(f"Unknown initial state: {initial_state}")
+        self.state = initial_state
 
         # Log initial state
-        self._log_initial_state(initial_state)
+        if log_initial:
+            self._log_initial_state(initial_state)
 
     # ─────────────────────────────────────────────────────────────────────
     # IStateMachine Implementation
@@ -147,11 +174,7 @@ class SentinelStateMachine(IStateMachine):
 
     def can_transition(self, to_state: str) -> bool:
         """Check if transition to target state is valid."""
-        # Find a trigger that would get us to the target state
-        for transition in self.TRANSITIONS:
-            if transition["source"] == self.state and transition["dest"] == to_state:
-                return True
-        return False
+        return (self.state, to_state) in _TRIGGER_FOR_EDGE
 
     def transition(self, to_state: str, metadata: dict = None) -> bool:
         """
@@ -178,35 +201,106 @@ class SentinelStateMachine(IStateMachine):
         self._pending_metadata = metadata or {}
 
         # Execute the transition
-        trigger_method = getattr(self, trigger)
-        return trigger_method()
+        return self._fire(trigger)
 
-    def get_transition_history(self) -> list[dict]:
-        """Get history of state transitions."""
-        return [t.to_dict() for t in self._history]
+    def get_transition_history(self) -> list[StateTransition]:
+        """
+        Get history of state transitions.
+
+        Returns the records themselves (oldest first); call to_dict() on
+        them only where a serialized form is needed.
+        """
+        return list(self._history)
 
     # ─────────────────────────────────────────────────────────────────────
-    # Transition Callbacks
+    # Triggers
     # ─────────────────────────────────────────────────────────────────────
 
-    def _before_transition(self, event: EventData) -> None:
-        """Called before any state transition."""
-        logger.debug(
-            f"Transition starting: {event.transition.source} → {event.transition.dest} "
-            f"(trigger: {event.event.name})"
-        )
+    def detect_event(self) -> bool:
+        """MONITOR → DETECT."""
+        return self._fire("detect_event")
+
+    def start_analysis(self) -> bool:
+        """DETECT → ANALYZE."""
+        return self._fire("start_analysis")
+
+    def detect_conflict(self) -> bool:
+        """ANALYZE → CONFLICT_RESOLUTION."""
+        return self._fire("detect_conflict")
+
+    def no_conflict(self) -> bool:
+        """ANALYZE → RECOMMEND."""
+        return self._fire("no_conflict")
+
+    def resolve_conflict(self) -> bool:
+        """CONFLICT_RESOLUTION → RECOMMEND."""
+        return self._fire("resolve_conflict")
+
+    def approve(self) -> bool:
+        """RECOMMEND → APPROVED."""
+        return self._fire("approve")
+
+    def execute(self) -> bool:
+        """APPROVED → EXECUTE."""
+        return self._fire("execute")
 
-    def _after_transition(self, event: EventData) -> None:
+    def complete(self) -> bool:
+        """EXECUTE → MONITOR."""
+        return self._fire("complete")
+
+    def reset(self) -> bool:
+        """DETECT/ANALYZE/CONFLICT_RESOLUTION → MONITOR."""
+        return self._fire("reset")
+
+    def reject(self) -> bool:
+        """RECOMMEND → MONITOR."""
+        return self._fire("reject")
+
+    def abort(self) -> bool:
+        """APPROVED/EXECUTE → MONITOR."""
+        return self._fire("abort")
+
+    def _fire(self, trigger: str) -> bool:
+        """
+        Apply a trigger to the current state.
+
+        Args:
+            trigger: Trigger name from the transition table
+
+        Returns:
+            True once the transition has been applied
+
+        Raises:
+            InvalidTransitionError: If the trigger is not valid from the current state
+        """
+        source = self.state
+        dest = _NEXT_STATE.get((source, trigger))
+        if dest is None:
+            self._pending_metadata = {}
+            raise InvalidTransitionError(
+                f"Can't trigger '{trigger}' from state {source}"
+            )
+
+        logger.debug(f"Transition starting: {source} → {dest} (trigger: {trigger})")
+        self.state = dest
+        self._after_transition(source, dest, trigger)
+        return True
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Transition Callbacks
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _after_transition(self, source: str, dest: str, trigger: str) -> None:
         """Called after any state transition."""
-        # Get metadata if available
-        metadata = getattr(self, "_pending_metadata", {})
+        # Take metadata staged by transition()/reset_to_monitor()
+        metadata = self._pending_metadata
         self._pending_metadata = {}
 
         # Create transition record
         transition = StateTransition(
-            from_state=event.transition.source,
-            to_state=event.transition.dest,
-            trigger=event.event.name,
+            from_state=source,
+            to_state=dest,
+            trigger=trigger,
             timestamp=datetime.now(timezone.utc),
             session_id=self.session_id,
             metadata=metadata,
@@ -218,13 +312,13 @@ class SentinelStateMachine(IStateMachine):
                 "event_type": AuditEventType.STATE_TRANSITION.value,
                 **transition.to_dict(),
             })
-            transition.merkle_hash = merkle_hash
+            transition = replace(transition, merkle_hash=merkle_hash)
 
         # Add to history
         self._history.append(transition)
 
         # Call registered callbacks
-        self._invoke_callbacks(event.transition.dest, transition)
+        self._invoke_callbacks(dest, transition)
 
         logger.info(
             f"State transition: {transition.from_state} → {transition.to_state} "
@@ -250,10 +344,7 @@ class SentinelStateMachine(IStateMachine):
 
     def _find_trigger(self, from_state: str, to_state: str) -> Optional[str]:
         """Find the trigger name for a state transition."""
-        for transition in self.TRANSITIONS:
-            if transition["source"] == from_state and transition["dest"] == to_state:
-                return transition["trigger"]
-        return None
+        return _TRIGGER_FOR_EDGE.get((from_state, to_state))
 
     def _invoke_callbacks(self, state: str, transition: StateTransition) -> None:
         """Invoke registered callbacks for a state."""
@@ -328,11 +419,7 @@ class SentinelStateMachine(IStateMachine):
 
     def get_available_triggers(self) -> list[str]:
         """Get list of valid triggers for current state."""
-        triggers = []
-        for transition in self.TRANSITIONS:
-            if transition["source"] == self.state:
-                triggers.append(transition["trigger"])
-        return triggers
+        return list(_AVAILABLE_TRIGGERS[self.state])
 
     def get_last_transition(self) -> Optional[StateTransition]:
         """Get the most recent transition."""
@@ -412,6 +499,7 @@ class StateMachineFactory:
         self,
         session_id: str,
         initial_state: str = SystemState.MONITOR.value,
+        log_initial: bool = True,
     ) -> SentinelStateMachine:
         """
         Create a new state machine.
@@ -419,6 +507,8 @@ class StateMachineFactory:
         Args:
             session_id: Session identifier
             initial_state: Starting state
+            log_initial: Log the initial state to the Merkle chain; pass
+                False when bulk-creating sessions that may never transition
 
         Returns:
             New SentinelStateMachine instance
@@ -427,6 +517,7 @@ class StateMachineFactory:
             session_id=session_id,
             merkle_chain=self._merkle_chain,
             initial_state=initial_state,
+            log_initial=log_initial,
         )
         self._machines[session_id] = machine
         return machine
@@ -442,6 +533,10 @@ class StateMachineFactory:
             return True
         return False
 
+    def clear(self) -> None:
+        """Drop all tracked state machines."""
+        self._machines.clear()
+
     def get_all_states(self) -> dict[str, str]:
         """Get current state of all machines."""
         return {
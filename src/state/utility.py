@@ -16,8 +16,9 @@ Reference: docs/IMPLEMENTATION_PLAN.md Phase 2, Step 2.6
 from __future__ import annotations
 
 import logging
-from typing import Optional
-from dataclasses import dataclass
+import math
+from typing import Iterator, Optional, overload
+from dataclasses import dataclass, field
 
 from src.contracts.interfaces import IUtilityFunction
 from src.contracts.schemas import (
@@ -33,14 +34,34 @@ from src.contracts.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Dimension order shared by UtilityScore.calculate and the ranking pass
+DIMENSIONS: tuple[str, ...] = (
+    "risk_reduction",
+    "tax_savings",
+    "goal_alignment",
+    "transaction_cost",
+    "urgency",
+)
+
+
+def _weight_vector(weights: UtilityWeights) -> tuple[float, ...]:
+    """Weights as a tuple in DIMENSIONS order."""
+    return (
+        weights.risk_reduction,
+        weights.tax_savings,
+        weights.goal_alignment,
+        weights.transaction_cost,
+        weights.urgency,
+    )
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # SCORING CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(frozen=True)
 class ScoringConfig:
-    """Configuration for utility scoring."""
+    """Configuration for utility scoring (immutable; use replace() to vary)."""
     # Risk thresholds
     concentration_limit: float = 0.15
     max_sector_weight: float = 0.30
@@ -58,10 +79,32 @@ class ScoringConfig:
     high_urgency_threshold: int = 6
 
 
+# Shared default for UtilityFunction instances built without a config
+_DEFAULT_SCORING_CONFIG = ScoringConfig()
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # DIMENSION SCORERS
 # ═══════════════════════════════════════════════════════════════════════════
 
+_TRADE_ACTIONS = frozenset({TradeAction.BUY, TradeAction.SELL})
+
+
+def price_lookup(portfolio: Portfolio) -> dict[str, float]:
+    """
+    Flatten a portfolio's holdings to ticker → current price.
+
+    Scoring only needs prices, so ranking builds this plain dict once per
+    portfolio instead of scanning the validated Holding models for every
+    action step. The first holding wins for a repeated ticker, matching
+    Portfolio.get_holding.
+    """
+    prices: dict[str, float] = {}
+    for h in portfolio.holdings:
+        prices.setdefault(h.ticker, h.current_price)
+    return prices
+
+
 class RiskScorer:
     """Score risk reduction dimension."""
 
@@ -80,8 +123,8 @@ class RiskScorer:
         expected = scenario.expected_outcomes
 
         # Check concentration reduction
-        concentration_before = expected.get("concentration_before", 0)
-        concentration_after = expected.get("concentration_after", 0)
+        concentration_before = expected.concentration_before
+        concentration_after = expected.concentration_after
 
         if concentration_before > config.concentration_limit:
             # Reward for reducing concentration
@@ -92,7 +135,7 @@ class RiskScorer:
                 score += min(2.0, reduction * 20)  # Partial credit
 
         # Check diversification improvement
-        diversification_delta = expected.get("diversification_delta", 0)
+        diversification_delta = expected.diversification_delta
         score += min(1.0, diversification_delta * 10)
 
         # Penalize for introducing new risks
@@ -101,7 +144,7 @@ class RiskScorer:
             score -= min(2.0, new_risks * 0.5)
 
         # Check sector exposure normalization
-        sector_improvement = expected.get("sector_improvement", 0)
+        sector_improvement = expected.sector_improvement
         score += min(1.0, sector_improvement * 5)
 
         return max(0.0, min(10.0, score))
@@ -125,7 +168,7 @@ class TaxScorer:
         expected = scenario.expected_outcomes
 
         # Direct tax impact
-        tax_impact = expected.get("tax_impact", 0)
+        tax_impact = expected.tax_impact
         if tax_impact < 0:
             # Tax savings (negative impact = good)
             score += min(3.0, abs(tax_impact) / 5000)
@@ -134,16 +177,16 @@ class TaxScorer:
             score -= min(3.0, tax_impact / 5000)
 
         # Wash sale violations
-        wash_sale_count = expected.get("wash_sale_violations", 0)
+        wash_sale_count = expected.wash_sale_violations
         score -= wash_sale_count * config.wash_sale_penalty
 
         # Tax loss harvesting opportunities captured
-        harvest_count = expected.get("harvest_opportunities_captured", 0)
+        harvest_count = expected.harvest_opportunities_captured
         score += harvest_count * config.harvest_bonus
 
         # Long-term vs short-term gains
-        lt_gains = expected.get("long_term_gains", 0)
-        st_gains = expected.get("short_term_gains", 0)
+        lt_gains = expected.long_term_gains
+        st_gains = expected.short_term_gains
         if lt_gains > 0 and st_gains > 0:
             # Prefer long-term gains (lower tax rate)
             lt_ratio = lt_gains / (lt_gains + st_gains)
@@ -171,19 +214,19 @@ class GoalScorer:
         client = portfolio.client_profile
 
         # Allocation drift correction
-        drift_before = expected.get("drift_before", 0)
-        drift_after = expected.get("drift_after", 0)
+        drift_before = expected.drift_before
+        drift_after = expected.drift_after
 
         if drift_before > 0:
             drift_reduction = drift_before - drift_after
             score += min(2.5, drift_reduction / drift_before * 2.5)
 
         # Target allocation alignment
-        target_alignment = expected.get("target_alignment", 0.5)
+        target_alignment = expected.target_alignment
         score += (target_alignment - 0.5) * 4  # -2 to +2
 
         # Risk profile alignment
-        risk_alignment = expected.get("risk_profile_alignment", 0.5)
+        risk_alignment = expected.risk_profile_alignment
         if client.risk_tolerance == RiskProfile.CONSERVATIVE:
             # Conservative clients care more about risk alignment
             score += (risk_alignment - 0.5) * 3
@@ -191,8 +234,8 @@ class GoalScorer:
             score += (risk_alignment - 0.5) * 2
 
         # Income/growth preference alignment
-        income_preference = expected.get("income_alignment", 0)
-        growth_preference = expected.get("growth_alignment", 0)
+        income_preference = expected.income_alignment
+        growth_preference = expected.growth_alignment
 
         if client.risk_tolerance == RiskProfile.CONSERVATIVE:
             score += income_preference * 0.5
@@ -209,20 +252,29 @@ class CostScorer:
     def score(
         scenario: Scenario,
         portfolio: Portfolio,
-        config: ScoringConfig
+        config: ScoringConfig,
+        prices: Optional[dict[str, float]] = None,
     ) -> float:
         """
         Score transaction cost efficiency (0-10).
 
         Higher score = lower transaction cost.
+
+        Args:
+            scenario: Scenario to score
+            portfolio: Portfolio context
+            config: Scoring configuration
+            prices: Ticker → current price, as built by price_lookup();
+                computed from the portfolio when not supplied
         """
+        if prices is None:
+            prices = price_lookup(portfolio)
+
         # Calculate total trade value
         total_value = 0
         for step in scenario.action_steps:
-            if step.action in [TradeAction.BUY, TradeAction.SELL]:
-                holding = portfolio.get_holding(step.ticker)
-                price = holding.current_price if holding else 0
-                total_value += step.quantity * price
+            if step.action in _TRADE_ACTIONS:
+                total_value += step.quantity * prices.get(step.ticker, 0)
 
         # Estimate total costs
         commission_cost = total_value * config.estimated_commission_rate
@@ -230,7 +282,7 @@ class CostScorer:
         total_cost = commission_cost + spread_cost
 
         # Add any explicit costs from expected outcomes
-        explicit_costs = scenario.expected_outcomes.get("transaction_costs", 0)
+        explicit_costs = scenario.expected_outcomes.transaction_costs
         total_cost += explicit_costs
 
         # Score inversely proportional to cost
@@ -238,7 +290,6 @@ class CostScorer:
             return 10.0
 
         # Scale: $100 = 10, $1000 = 8, $10000 = 5, $50000 = 2
-        import math
         score = 10 - math.log10(max(1, total_cost / config.min_cost_threshold)) * 2.5
 
         return max(0.0, min(10.0, score))
@@ -264,11 +315,11 @@ class UrgencyScorer:
         expected = scenario.expected_outcomes
 
         # Base urgency from scenario
-        scenario_urgency = expected.get("urgency_level", 5)
+        scenario_urgency = expected.urgency_level
 
         # Check if scenario addresses urgent issues
-        addresses_urgent = expected.get("addresses_urgent_issues", False)
-        issue_urgency = expected.get("issue_urgency", 5)
+        addresses_urgent = expected.addresses_urgent_issues
+        issue_urgency = expected.issue_urgency
 
         if addresses_urgent and issue_urgency >= config.critical_urgency_threshold:
             # Scenario addresses critical issues - reward proportionally
@@ -309,9 +360,9 @@ class UtilityFunction(IUtilityFunction):
         Initialize utility function.
 
         Args:
-            config: Scoring configuration (default: ScoringConfig())
+            config: Scoring configuration (default: shared ScoringConfig())
         """
-        self.config = config or ScoringConfig()
+        self.config = config if config is not None else _DEFAULT_SCORING_CONFIG
 
         # Individual scorers
         self._risk_scorer = RiskScorer()
@@ -337,12 +388,27 @@ class UtilityFunction(IUtilityFunction):
         Returns:
             UtilityScore with breakdown
         """
-        # Calculate raw scores for each dimension
+        return UtilityScore.calculate(
+            scenario_id=scenario.scenario_id,
+            raw_scores=self._raw_scores(scenario, portfolio),
+            weights=weights,
+            rank=1  # Will be updated during ranking
+        )
+
+    def _raw_scores(
+        self,
+        scenario: Scenario,
+        portfolio: Portfolio,
+        prices: Optional[dict[str, float]] = None,
+    ) -> dict[str, float]:
+        """Raw 0-10 score for each dimension of a scenario."""
         raw_scores = {
             "risk_reduction": self._risk_scorer.score(scenario, portfolio, self.config),
             "tax_savings": self._tax_scorer.score(scenario, portfolio, self.config),
             "goal_alignment": self._goal_scorer.score(scenario, portfolio, self.config),
-            "transaction_cost": self._cost_scorer.score(scenario, portfolio, self.config),
+            "transaction_cost": self._cost_scorer.score(
+                scenario, portfolio, self.config, prices
+            ),
             "urgency": self._urgency_scorer.score(scenario, portfolio, self.config),
         }
 
@@ -354,14 +420,7 @@ class UtilityFunction(IUtilityFunction):
             f"cost={raw_scores['transaction_cost']:.1f}, "
             f"urgency={raw_scores['urgency']:.1f}"
         )
-
-        # Calculate weighted utility score
-        return UtilityScore.calculate(
-            scenario_id=scenario.scenario_id,
-            raw_scores=raw_scores,
-            weights=weights,
-            rank=1  # Will be updated during ranking
-        )
+        return raw_scores
 
     def rank_scenarios(
         self,
@@ -383,25 +442,31 @@ class UtilityFunction(IUtilityFunction):
         if not scenarios:
             return []
 
-        # Score all scenarios
-        scores = [
-            self.score_scenario(scenario, portfolio, weights)
-            for scenario in scenarios
-        ]
-
-        # Sort by total score (descending)
-        sorted_scores = sorted(scores, key=lambda s: s.total_score, reverse=True)
-
-        # Update ranks
-        ranked_scores = []
-        for i, score in enumerate(sorted_scores, start=1):
-            ranked_score = UtilityScore(
-                scenario_id=score.scenario_id,
-                dimension_scores=score.dimension_scores,
-                total_score=score.total_score,
-                rank=i
+        # Raw scores and weighted totals in one pass; totals are summed in
+        # the same order as UtilityScore.calculate so sorting matches it
+        weight_vector = _weight_vector(weights)
+        prices = price_lookup(portfolio)
+        scored = []
+        for scenario in scenarios:
+            raw_scores = self._raw_scores(scenario, portfolio, prices)
+            total = sum(
+                raw_scores[dim] * w * 10
+                for dim, w in zip(DIMENSIONS, weight_vector)
+            )
+            scored.append((total, scenario.scenario_id, raw_scores))
+
+        # Sort by total score (descending, stable) and build each
+        # UtilityScore once with its final rank
+        scored.sort(key=lambda item: item[0], reverse=True)
+        ranked_scores = [
+            UtilityScore.calculate(
+                scenario_id=scenario_id,
+                raw_scores=raw_scores,
+                weights=weights,
+                rank=i,
             )
-            ranked_scores.append(ranked_score)
+            for i, (_, scenario_id, raw_scores) in enumerate(scored, start=1)
+        ]
 
         logger.info(
             f"Ranked {len(ranked_scores)} scenarios. "
@@ -456,11 +521,41 @@ class UtilityFunctionFactory:
 # CONVENIENCE FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
+@dataclass(slots=True)
+class Ranking:
+    """
+    Ranked utility scores with lookup by scenario_id.
+
+    Behaves like the ranked list (len, iteration, indexing) so callers
+    that treated score_and_rank's result as a list keep working.
+    """
+    ordered: list[UtilityScore]
+    by_id: dict[str, UtilityScore] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.by_id = {score.scenario_id: score for score in self.ordered}
+
+    def __len__(self) -> int:
+        return len(self.ordered)
+
+    def __iter__(self) -> Iterator[UtilityScore]:
+        return iter(self.ordered)
+
+    @overload
+    def __getitem__(self, index: int) -> UtilityScore: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[UtilityScore]: ...
+
+    def __getitem__(self, index):
+        return self.ordered[index]
+
+
 def score_and_rank(
     scenarios: list[Scenario],
     portfolio: Portfolio,
     risk_profile: Optional[RiskProfile] = None
-) -> list[UtilityScore]:
+) -> Ranking:
     """
     Convenience function to score and rank scenarios.
 
@@ -470,7 +565,7 @@ def score_and_rank(
         risk_profile: Override risk profile (default: use portfolio's)
 
     Returns:
-        Ranked list of UtilityScores
+        Ranking of UtilityScores (best first), indexable by scenario_id
     """
     # Get weights from profile
     profile = risk_profile or portfolio.client_profile.risk_tolerance
@@ -478,4 +573,4 @@ def score_and_rank(
 
     # Create and run utility function
     utility_fn = UtilityFunction()
-    return utility_fn.rank_scenarios(scenarios, portfolio, weights)
+    return Ranking(utility_fn.rank_scenarios(scenarios, portfolio, weights))
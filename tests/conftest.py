@@ -7,10 +7,14 @@ Shared fixtures for all tests.
 import pytest
 import asyncio
 from datetime import datetime, timezone
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable, Optional
+from uuid import uuid4
 
 from src.contracts.schemas import (
     EventType,
+    InputEvent,
+    HeartbeatInput,
+    MarketEventInput,
     RiskProfile,
     Portfolio,
     Holding,
@@ -21,7 +25,7 @@ from src.contracts.schemas import (
     TradeAction,
 )
 from src.contracts.interfaces import IMerkleChain
-from src.gateway import Gateway
+from src.gateway import Gateway, EventFactory
 
 import hashlib
 import json
@@ -92,12 +96,13 @@ class StubMerkleChain(IMerkleChain):
 # EVENT LOOP
 # ═══════════════════════════════════════════════════════════════════════════
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def pytest_configure(config):
+    """Run async tests on uvloop when it is installed (not on Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -110,16 +115,73 @@ def merkle_chain():
     return StubMerkleChain()
 
 
+@pytest.fixture(scope="class")
+def shared_merkle_chain():
+    """One stub Merkle chain per test class, for class-scoped consumers."""
+    return StubMerkleChain()
+
+
 @pytest.fixture
-async def gateway(merkle_chain) -> AsyncGenerator[Gateway, None]:
-    """Create a gateway instance for testing."""
-    gw = Gateway(
-        merkle_chain=merkle_chain,
-        enable_scheduler=False,  # Disable scheduler for most tests
-    )
-    await gw.start()
-    yield gw
-    await gw.stop()
+def merkle_baseline(merkle_chain) -> int:
+    """Block count of the Merkle chain before the test adds anything."""
+    return merkle_chain.get_block_count()
+
+
+@pytest.fixture(scope="module")
+def shared_gateway() -> Gateway:
+    """Create one scheduler-less gateway per module (reset per test)."""
+    return Gateway(enable_scheduler=False)  # Disable scheduler for most tests
+
+
+def reset_gateway(gw: Gateway, merkle_chain: IMerkleChain) -> None:
+    """Return a shared gateway to its freshly constructed state."""
+    gw._queues.clear()
+    for handlers in gw._handlers.values():
+        handlers.clear()
+    gw._processing_tasks.clear()
+    gw._events_received = 0
+    gw._events_rejected = 0
+    gw._events_processed = 0
+    gw._merkle_chain = merkle_chain
+
+
+@pytest.fixture
+async def gateway(shared_gateway, merkle_chain) -> AsyncGenerator[Gateway, None]:
+    """Provide the module's gateway, reset and started for this test."""
+    reset_gateway(shared_gateway, merkle_chain)
+    await shared_gateway.start()
+    yield shared_gateway
+    await shared_gateway.stop()
+
+
+@pytest.fixture
+async def idle_gateway(shared_gateway, merkle_chain) -> AsyncGenerator[Gateway, None]:
+    """Provide the module's gateway reset but not started (stopped after)."""
+    reset_gateway(shared_gateway, merkle_chain)
+    yield shared_gateway
+    await shared_gateway.stop()
+
+
+@pytest.fixture
+def counting_handler() -> Callable[..., Callable]:
+    """
+    Factory for lightweight async handlers that record received events.
+
+    Cheaper than AsyncMock: each call is a list append. Pass side_effect
+    to raise after recording the event.
+    """
+    def make(side_effect: Optional[BaseException] = None) -> Callable:
+        calls: list = []
+
+        async def handler(event):
+            calls.append(event)
+            if side_effect is not None:
+                raise side_effect
+
+        handler.calls = calls
+        return handler
+
+    return make
 
 
 @pytest.fixture
@@ -134,6 +196,50 @@ async def gateway_with_scheduler(merkle_chain) -> AsyncGenerator[Gateway, None]:
     await gw.stop()
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# EVENT FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _event_cache_key(kwargs: dict) -> tuple:
+    """Hashable key for EventFactory kwargs (lists become tuples)."""
+    return tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v)
+        for k, v in kwargs.items()
+    ))
+
+
+def _memoized_event_factory(create: Callable, id_prefix: str) -> Callable:
+    """
+    Wrap an EventFactory method so each kwarg set is validated only once.
+
+    Callers get a shallow model_copy with a fresh event_id, so events
+    stay distinct without re-running Pydantic validation.
+    """
+    cache: dict[tuple, InputEvent] = {}
+
+    def make(**kwargs) -> InputEvent:
+        key = _event_cache_key(kwargs)
+        if key not in cache:
+            cache[key] = create(**kwargs)
+        return cache[key].model_copy(
+            update={"event_id": f"{id_prefix}_{uuid4().hex[:12]}"}
+        )
+
+    return make
+
+
+@pytest.fixture(scope="module")
+def make_heartbeat() -> Callable[..., HeartbeatInput]:
+    """Memoized EventFactory.create_heartbeat."""
+    return _memoized_event_factory(EventFactory.create_heartbeat, "hb")
+
+
+@pytest.fixture(scope="module")
+def make_market_event() -> Callable[..., MarketEventInput]:
+    """Memoized EventFactory.create_market_event."""
+    return _memoized_event_factory(EventFactory.create_market_event, "mkt")
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # PORTFOLIO FIXTURES
 # ═══════════════════════════════════════════════════════════════════════════
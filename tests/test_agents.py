@@ -282,6 +282,18 @@ class TestOfflineDriftAnalyzer:
         asset_classes = [m.asset_class for m in result.drift_metrics]
         assert any("Equit" in ac for ac in asset_classes)
 
+    def test_drift_metrics_match_targets(self, sample_portfolio):
+        """Each metric pairs the class's current weight with its target."""
+        result = OfflineDriftAnalyzer.analyze(sample_portfolio)
+        targets = sample_portfolio.target_allocation.by_asset_class()
+
+        assert [m.asset_class for m in result.drift_metrics] == list(targets)
+        for metric in result.drift_metrics:
+            assert metric.target_weight == targets[metric.asset_class]
+            assert metric.drift_pct == pytest.approx(
+                abs(metric.current_weight - metric.target_weight)
+            )
+
     def test_recommended_trades_generated(self, sample_portfolio):
         """Test recommended trades are generated for concentration risks."""
         result = OfflineDriftAnalyzer.analyze(sample_portfolio)
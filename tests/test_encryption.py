@@ -7,7 +7,6 @@ Reference: docs/IMPLEMENTATION_PLAN.md Phase 1, Security Tests
 """
 
 import pytest
-import os
 import hashlib
 
 from src.security.encryption import (
@@ -17,10 +16,22 @@ from src.security.encryption import (
     generate_master_key,
     AES_KEY_SIZE,
     MASTER_KEY_ENV_VAR,
+    MAX_FIELD_DEPTH,
 )
 from src.contracts.security import EncryptedField
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# TEST KEYS
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Derived once at import; tests only need distinct 32-byte keys
+_KEY1 = hashlib.sha256(b"key1").digest()
+_KEY2 = hashlib.sha256(b"key2").digest()
+_OLD_KEY = hashlib.sha256(b"old-key").digest()
+_NEW_KEY = hashlib.sha256(b"new-key").digest()
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # FIXTURES
 # ═══════════════════════════════════════════════════════════════════════════
@@ -47,37 +58,19 @@ def field_encryptor(encryption_service):
 class TestEncryptionRoundtrip:
     """Test encryption and decryption."""
 
-    def test_roundtrip_simple_string(self, encryption_service):
-        """Test encrypting and decrypting a simple string."""
-        plaintext = "Hello, World!"
-        encrypted = encryption_service.encrypt_field(plaintext)
-        decrypted = encryption_service.decrypt_field(encrypted)
-        assert decrypted == plaintext
-
-    def test_roundtrip_unicode(self, encryption_service):
-        """Test encrypting unicode content."""
-        plaintext = "Unicode: 你好世界 🔐 مرحبا"
-        encrypted = encryption_service.encrypt_field(plaintext)
-        decrypted = encryption_service.decrypt_field(encrypted)
-        assert decrypted == plaintext
-
-    def test_roundtrip_long_string(self, encryption_service):
-        """Test encrypting longer content."""
-        plaintext = "A" * 10000  # 10KB of data
-        encrypted = encryption_service.encrypt_field(plaintext)
-        decrypted = encryption_service.decrypt_field(encrypted)
-        assert decrypted == plaintext
-
-    def test_roundtrip_special_characters(self, encryption_service):
-        """Test encrypting special characters."""
-        plaintext = "SSN: 123-45-6789\nAddress: 123 Main St.\n\"Quoted\""
-        encrypted = encryption_service.encrypt_field(plaintext)
-        decrypted = encryption_service.decrypt_field(encrypted)
-        assert decrypted == plaintext
-
-    def test_roundtrip_empty_string(self, encryption_service):
-        """Test encrypting empty string."""
-        plaintext = ""
+    @pytest.mark.parametrize(
+        "plaintext",
+        [
+            "Hello, World!",
+            "Unicode: 你好世界 🔐 مرحبا",
+            "A" * 10000,  # 10KB of data
+            "SSN: 123-45-6789\nAddress: 123 Main St.\n\"Quoted\"",
+            "",
+        ],
+        ids=["simple", "unicode", "long", "special", "empty"],
+    )
+    def test_roundtrip(self, encryption_service, plaintext):
+        """Test encrypting and decrypting various payloads."""
         encrypted = encryption_service.encrypt_field(plaintext)
         decrypted = encryption_service.decrypt_field(encrypted)
         assert decrypted == plaintext
@@ -128,11 +121,8 @@ class TestSecurityProperties:
     def test_wrong_key_fails_decryption(self):
         """Test that wrong key cannot decrypt."""
         # Create two services with different keys
-        key1 = hashlib.sha256(b"key1").digest()
-        key2 = hashlib.sha256(b"key2").digest()
-
-        service1 = EncryptionService(master_key=key1)
-        service2 = EncryptionService(master_key=key2)
+        service1 = EncryptionService(master_key=_KEY1)
+        service2 = EncryptionService(master_key=_KEY2)
 
         encrypted = service1.encrypt_field("secret data")
 
@@ -246,6 +236,51 @@ class TestFieldEncryptor:
         assert decrypted["client"]["ssn"] == "123-45-6789"
         assert decrypted["client"]["name"] == "John Doe"
 
+    def test_handles_deeply_nested_dicts(self, field_encryptor):
+        """Test that nesting up to MAX_FIELD_DEPTH is supported."""
+        data = {"ssn": "123-45-6789"}
+        for _ in range(MAX_FIELD_DEPTH):
+            data = {"level": data}
+
+        encrypted = field_encryptor.encrypt_fields(data)
+        decrypted = field_encryptor.decrypt_fields(encrypted)
+
+        for _ in range(MAX_FIELD_DEPTH):
+            decrypted = decrypted["level"]
+        assert decrypted == {"ssn": "123-45-6789"}
+
+    def test_rejects_excessive_nesting(self, field_encryptor):
+        """Test that nesting past MAX_FIELD_DEPTH raises ValueError."""
+        data = {"ssn": "123-45-6789"}
+        for _ in range(MAX_FIELD_DEPTH + 1):
+            data = {"level": data}
+
+        with pytest.raises(ValueError, match="nested deeper"):
+            field_encryptor.encrypt_fields(data)
+        with pytest.raises(ValueError, match="nested deeper"):
+            field_encryptor.decrypt_fields(data)
+
+    def test_rejects_self_referencing_dicts(self, field_encryptor):
+        """Test that a reference cycle fails fast instead of looping."""
+        data = {"client": {"ssn": "123-45-6789"}}
+        data["client"]["self"] = data
+
+        with pytest.raises(ValueError, match="reference cycle"):
+            field_encryptor.encrypt_fields(data)
+        with pytest.raises(ValueError, match="reference cycle"):
+            field_encryptor.decrypt_fields(data)
+
+    def test_shared_nested_dict_is_not_a_cycle(self, field_encryptor):
+        """Test that one dict reused under two keys is still encrypted twice."""
+        contact = {"email": "jd@example.com"}
+        data = {"primary": contact, "billing": contact}
+
+        decrypted = field_encryptor.decrypt_fields(
+            field_encryptor.encrypt_fields(data)
+        )
+
+        assert decrypted == {"primary": contact, "billing": contact}
+
     def test_handles_non_string_values(self, field_encryptor):
         """Test that non-string values are not encrypted."""
         data = {
@@ -277,8 +312,8 @@ class TestKeyGeneration:
 
     def test_generate_master_key_uniqueness(self):
         """Test that generated keys are unique."""
-        keys = [generate_master_key() for _ in range(100)]
-        assert len(set(keys)) == 100  # All unique
+        keys = {generate_master_key() for _ in range(100)}
+        assert len(keys) == 100  # All unique
 
     def test_generate_master_key_is_hex(self):
         """Test that generated key is valid hex."""
@@ -293,27 +328,23 @@ class TestKeyGeneration:
 class TestEnvironmentKey:
     """Test loading key from environment."""
 
-    def test_missing_env_raises_error(self):
+    def test_missing_env_raises_error(self, monkeypatch):
         """Test that missing environment key raises error."""
         # Ensure key is not set
-        if MASTER_KEY_ENV_VAR in os.environ:
-            del os.environ[MASTER_KEY_ENV_VAR]
+        monkeypatch.delenv(MASTER_KEY_ENV_VAR, raising=False)
 
         with pytest.raises(RuntimeError, match="Master encryption key not configured"):
             EncryptionService()
 
-    def test_env_key_works(self):
+    def test_env_key_works(self, monkeypatch):
         """Test that environment key is used correctly."""
-        # Set test key
-        os.environ[MASTER_KEY_ENV_VAR] = generate_master_key()
+        # Set test key (restored automatically by monkeypatch)
+        monkeypatch.setenv(MASTER_KEY_ENV_VAR, generate_master_key())
 
-        try:
-            service = EncryptionService()
-            encrypted = service.encrypt_field("test")
-            decrypted = service.decrypt_field(encrypted)
-            assert decrypted == "test"
-        finally:
-            del os.environ[MASTER_KEY_ENV_VAR]
+        service = EncryptionService()
+        encrypted = service.encrypt_field("test")
+        decrypted = service.decrypt_field(encrypted)
+        assert decrypted == "test"
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -325,11 +356,8 @@ class TestKeyRotation:
 
     def test_re_encrypt_with_new_key(self):
         """Test re-encrypting data with a new key."""
-        old_key = hashlib.sha256(b"old-key").digest()
-        new_key = hashlib.sha256(b"new-key").digest()
-
-        old_service = EncryptionService(master_key=old_key)
-        new_service = EncryptionService(master_key=new_key)
+        old_service = EncryptionService(master_key=_OLD_KEY)
+        new_service = EncryptionService(master_key=_NEW_KEY)
 
         plaintext = "sensitive data"
 
@@ -352,7 +380,6 @@ class TestKeyRotation:
         service = create_test_service()
         initial_version = service._key_version
 
-        new_key = hashlib.sha256(b"new-key").digest()
-        service.rotate_key(new_key)
+        service.rotate_key(_NEW_KEY)
 
         assert service._key_version == initial_version + 1
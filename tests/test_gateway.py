@@ -9,9 +9,9 @@ Reference: docs/IMPLEMENTATION_PLAN.md Phase 1, Workstream B
 import pytest
 import asyncio
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock
 
-from src.gateway import Gateway, EventFactory, SessionQueue, PriorityItem
+import src.gateway.gateway as gateway_module
+from src.gateway import EventFactory, SessionQueue, PriorityItem
 from src.contracts.schemas import (
     EventType,
     MarketEventInput,
@@ -21,6 +21,58 @@ from src.contracts.schemas import (
 )
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Fixed clock for every event created in this module
+FROZEN_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() always returns FROZEN_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW
+
+
+@pytest.fixture(autouse=True)
+def frozen_now(monkeypatch) -> datetime:
+    """Freeze datetime.now() inside the gateway module."""
+    monkeypatch.setattr(gateway_module, "datetime", _FrozenDatetime)
+    return FROZEN_NOW
+
+
+# (submitted priorities, expected processing order)
+PRIORITY_CASES = [
+    ([2, 9, 5], [9, 5, 2]),
+    ([1, 1, 1], [1, 1, 1]),
+    ([10, 5, 1], [10, 5, 1]),
+]
+
+
+@pytest.fixture
+def event_with_priority(make_heartbeat, make_market_event):
+    """Alternate market events and heartbeats so ordering spans event types."""
+    def make(session_id: str, priority: int, index: int):
+        if index % 2:
+            return make_market_event(
+                session_id=session_id,
+                affected_sectors=["Tech"],
+                magnitude=-0.05,
+                description=f"Event {index}",
+                priority=priority,
+            )
+        return make_heartbeat(
+            session_id=session_id,
+            portfolio_ids=[f"P{index}"],
+            priority=priority,
+        )
+
+    return make
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # PRIORITY QUEUE TESTS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -49,8 +101,8 @@ class TestPriorityItem:
         # Lower priority number = processed first (inverted)
         assert item_high < item_low  # 10 -> 0, 1 -> 9
 
-    def test_same_priority_timestamp_order(self):
-        """Same priority events should maintain timestamp order."""
+    def test_same_priority_sequence_order(self):
+        """Same priority events are ordered by insertion sequence."""
         event1 = EventFactory.create_heartbeat(
             session_id="test",
             portfolio_ids=["P1"],
@@ -62,22 +114,23 @@ class TestPriorityItem:
             priority=5,
         )
 
-        item1 = PriorityItem.from_event(event1)
-        item2 = PriorityItem.from_event(event2)
+        item1 = PriorityItem.from_event(event1, sequence=0)
+        item2 = PriorityItem.from_event(event2, sequence=1)
 
-        # Both have same priority, so they're equal in ordering
         assert item1.priority == item2.priority
+        assert item1 < item2
+        assert tuple(item1) == (5, 0, event1)
 
 
 class TestSessionQueue:
     """Tests for SessionQueue behavior."""
 
     @pytest.mark.asyncio
-    async def test_queue_put_get(self):
+    async def test_queue_put_get(self, make_market_event):
         """Test basic put and get operations."""
         queue = SessionQueue("test_session")
 
-        event = EventFactory.create_market_event(
+        event = make_market_event(
             session_id="test_session",
             affected_sectors=["Tech"],
             magnitude=-0.05,
@@ -91,57 +144,67 @@ class TestSessionQueue:
         assert retrieved.event_id == event.event_id
         assert queue.empty()
 
-    @pytest.mark.asyncio
-    async def test_queue_priority_ordering(self):
-        """Events should be retrieved in priority order."""
+    def test_queue_put_get_nowait(self, make_market_event):
+        """Non-blocking put and get behave like their async versions."""
         queue = SessionQueue("test_session")
 
-        # Add events with different priorities
-        low_priority = EventFactory.create_heartbeat(
-            session_id="test_session",
-            portfolio_ids=["P1"],
-            priority=2,
-        )
-        high_priority = EventFactory.create_market_event(
+        event = make_market_event(
             session_id="test_session",
             affected_sectors=["Tech"],
             magnitude=-0.05,
-            description="Urgent event",
-            priority=9,
-        )
-        medium_priority = EventFactory.create_heartbeat(
-            session_id="test_session",
-            portfolio_ids=["P2"],
-            priority=5,
+            description="Test event",
         )
 
-        # Add in random order
-        await queue.put(low_priority)
-        await queue.put(high_priority)
-        await queue.put(medium_priority)
+        queue.put_nowait(event)
+        assert queue.qsize() == 1
 
-        # Retrieve in priority order
-        first = await queue.get()
-        second = await queue.get()
-        third = await queue.get()
+        retrieved = queue.get_nowait()
+        assert retrieved.event_id == event.event_id
+        assert queue.empty()
 
-        assert first.priority == 9  # High priority first
-        assert second.priority == 5  # Medium second
-        assert third.priority == 2  # Low last
+    @pytest.mark.parametrize("priorities_in,priorities_out", PRIORITY_CASES)
+    def test_queue_priority_ordering(
+        self, priorities_in, priorities_out, event_with_priority
+    ):
+        """Events should be retrieved in priority order."""
+        queue = SessionQueue("test_session")
+
+        for i, priority in enumerate(priorities_in):
+            queue.put_nowait(event_with_priority("test_session", priority, i))
+
+        retrieved = [queue.get_nowait().priority for _ in priorities_in]
+
+        assert retrieved == priorities_out
+        assert queue.empty()
+
+    def test_queue_same_priority_fifo(self, make_heartbeat):
+        """Equal-priority events come out in insertion order."""
+        queue = SessionQueue("test_session")
+
+        events = [
+            make_heartbeat(session_id="test_session", portfolio_ids=["P1"])
+            for _ in range(5)
+        ]
+        for event in events:
+            queue.put_nowait(event)
+
+        retrieved = [queue.get_nowait().event_id for _ in events]
+
+        assert retrieved == [e.event_id for e in events]
 
     @pytest.mark.asyncio
     async def test_queue_empty_returns_none(self):
         """Getting from empty queue returns None."""
         queue = SessionQueue("test_session")
-        result = await queue.get()
-        assert result is None
+        assert await queue.get() is None
+        assert queue.get_nowait() is None
 
     @pytest.mark.asyncio
-    async def test_queue_peek(self):
+    async def test_queue_peek(self, make_heartbeat):
         """Peek returns item without removing."""
         queue = SessionQueue("test_session")
 
-        event = EventFactory.create_heartbeat(
+        event = make_heartbeat(
             session_id="test_session",
             portfolio_ids=["P1"],
         )
@@ -156,17 +219,15 @@ class TestSessionQueue:
         assert retrieved.event_id == event.event_id
         assert queue.empty()
 
-    @pytest.mark.asyncio
-    async def test_queue_total_processed(self):
+    def test_queue_total_processed(self, make_heartbeat):
         """Track total events processed."""
         queue = SessionQueue("test_session")
 
         for i in range(5):
-            event = EventFactory.create_heartbeat(
+            queue.put_nowait(make_heartbeat(
                 session_id="test_session",
                 portfolio_ids=[f"P{i}"],
-            )
-            await queue.put(event)
+            ))
 
         assert queue.total_processed == 5
 
@@ -179,9 +240,9 @@ class TestGatewaySubmit:
     """Tests for event submission."""
 
     @pytest.mark.asyncio
-    async def test_submit_event(self, gateway):
+    async def test_submit_event(self, gateway, make_market_event):
         """Test basic event submission."""
-        event = EventFactory.create_market_event(
+        event = make_market_event(
             session_id="advisor:main",
             affected_sectors=["Technology"],
             magnitude=-0.04,
@@ -194,9 +255,9 @@ class TestGatewaySubmit:
         assert gateway._events_received == 1
 
     @pytest.mark.asyncio
-    async def test_submit_creates_queue(self, gateway):
+    async def test_submit_creates_queue(self, gateway, make_heartbeat):
         """Submitting event creates queue for session."""
-        event = EventFactory.create_heartbeat(
+        event = make_heartbeat(
             session_id="new_session",
             portfolio_ids=["P1"],
         )
@@ -211,7 +272,7 @@ class TestGatewaySubmit:
         event = MarketEventInput(
             event_id="test_123",
             event_type=EventType.MARKET_EVENT,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=FROZEN_NOW,
             session_id="",  # Empty
             affected_sectors=["Tech"],
             magnitude=-0.05,
@@ -227,7 +288,7 @@ class TestGatewaySubmit:
         event = MarketEventInput(
             event_id="",  # Empty
             event_type=EventType.MARKET_EVENT,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=FROZEN_NOW,
             session_id="test_session",
             affected_sectors=["Tech"],
             magnitude=-0.05,
@@ -239,11 +300,11 @@ class TestGatewaySubmit:
         assert event_id.startswith("evt_")
 
     @pytest.mark.asyncio
-    async def test_submit_logs_to_merkle_chain(self, gateway, merkle_chain):
+    async def test_submit_logs_to_merkle_chain(
+        self, gateway, merkle_chain, merkle_baseline, make_market_event
+    ):
         """Event submission is logged to Merkle chain."""
-        initial_count = merkle_chain.get_block_count()
-
-        event = EventFactory.create_market_event(
+        event = make_market_event(
             session_id="advisor:main",
             affected_sectors=["Tech"],
             magnitude=-0.04,
@@ -252,37 +313,39 @@ class TestGatewaySubmit:
 
         await gateway.submit(event)
 
-        assert merkle_chain.get_block_count() == initial_count + 1
+        assert merkle_chain.get_block_count() == merkle_baseline + 1
 
 
 class TestGatewayHandlers:
     """Tests for handler registration and dispatch."""
 
     @pytest.mark.asyncio
-    async def test_register_handler(self, gateway):
+    async def test_register_handler(self, gateway, counting_handler):
         """Test handler registration."""
-        handler = AsyncMock()
+        handler = counting_handler()
 
         gateway.register_handler(EventType.MARKET_EVENT, handler)
 
-        assert handler in gateway._handlers[EventType.MARKET_EVENT]
+        assert any(h is handler for h in gateway._handlers[EventType.MARKET_EVENT])
 
     @pytest.mark.asyncio
-    async def test_register_handler_string_type(self, gateway):
+    async def test_register_handler_string_type(self, gateway, counting_handler):
         """Test handler registration with string event type."""
-        handler = AsyncMock()
+        handler = counting_handler()
 
         gateway.register_handler("market_event", handler)
 
-        assert handler in gateway._handlers[EventType.MARKET_EVENT]
+        assert any(h is handler for h in gateway._handlers[EventType.MARKET_EVENT])
 
     @pytest.mark.asyncio
-    async def test_handler_called_on_process(self, gateway):
+    async def test_handler_called_on_process(
+        self, gateway, counting_handler, make_market_event
+    ):
         """Handler is called when event is processed."""
-        handler = AsyncMock()
+        handler = counting_handler()
         gateway.register_handler(EventType.MARKET_EVENT, handler)
 
-        event = EventFactory.create_market_event(
+        event = make_market_event(
             session_id="test_session",
             affected_sectors=["Tech"],
             magnitude=-0.04,
@@ -292,18 +355,21 @@ class TestGatewayHandlers:
         await gateway.submit(event)
         await gateway.process_session("test_session")
 
-        handler.assert_called_once_with(event)
+        assert len(handler.calls) == 1
+        assert handler.calls[0] is event
 
     @pytest.mark.asyncio
-    async def test_multiple_handlers_called(self, gateway):
+    async def test_multiple_handlers_called(
+        self, gateway, counting_handler, make_heartbeat
+    ):
         """Multiple handlers for same event type are all called."""
-        handler1 = AsyncMock()
-        handler2 = AsyncMock()
+        handler1 = counting_handler()
+        handler2 = counting_handler()
 
         gateway.register_handler(EventType.HEARTBEAT, handler1)
         gateway.register_handler(EventType.HEARTBEAT, handler2)
 
-        event = EventFactory.create_heartbeat(
+        event = make_heartbeat(
             session_id="test_session",
             portfolio_ids=["P1"],
         )
@@ -311,39 +377,41 @@ class TestGatewayHandlers:
         await gateway.submit(event)
         await gateway.process_session("test_session")
 
-        handler1.assert_called_once()
-        handler2.assert_called_once()
+        assert len(handler1.calls) == 1
+        assert len(handler2.calls) == 1
 
     @pytest.mark.asyncio
-    async def test_unregister_handler(self, gateway):
+    async def test_unregister_handler(self, gateway, counting_handler):
         """Test handler unregistration."""
-        handler = AsyncMock()
+        handler = counting_handler()
         gateway.register_handler(EventType.MARKET_EVENT, handler)
 
         result = gateway.unregister_handler(EventType.MARKET_EVENT, handler)
 
         assert result is True
-        assert handler not in gateway._handlers[EventType.MARKET_EVENT]
+        assert all(h is not handler for h in gateway._handlers[EventType.MARKET_EVENT])
 
     @pytest.mark.asyncio
-    async def test_unregister_nonexistent_handler(self, gateway):
+    async def test_unregister_nonexistent_handler(self, gateway, counting_handler):
         """Unregistering non-existent handler returns False."""
-        handler = AsyncMock()
+        handler = counting_handler()
 
         result = gateway.unregister_handler(EventType.MARKET_EVENT, handler)
 
         assert result is False
 
     @pytest.mark.asyncio
-    async def test_handler_error_logged(self, gateway):
+    async def test_handler_error_logged(
+        self, gateway, counting_handler, make_market_event
+    ):
         """Handler errors are logged but don't stop processing."""
-        failing_handler = AsyncMock(side_effect=Exception("Handler failed"))
-        success_handler = AsyncMock()
+        failing_handler = counting_handler(side_effect=Exception("Handler failed"))
+        success_handler = counting_handler()
 
         gateway.register_handler(EventType.MARKET_EVENT, failing_handler)
         gateway.register_handler(EventType.MARKET_EVENT, success_handler)
 
-        event = EventFactory.create_market_event(
+        event = make_market_event(
             session_id="test_session",
             affected_sectors=["Tech"],
             magnitude=-0.04,
@@ -354,8 +422,8 @@ class TestGatewayHandlers:
         await gateway.process_session("test_session")
 
         # Both handlers called despite first failing
-        failing_handler.assert_called_once()
-        success_handler.assert_called_once()
+        assert len(failing_handler.calls) == 1
+        assert len(success_handler.calls) == 1
 
 
 class TestGatewayProcessing:
@@ -368,25 +436,32 @@ class TestGatewayProcessing:
         # Should not raise
 
     @pytest.mark.asyncio
-    async def test_process_drains_queue(self, gateway):
+    async def test_process_drains_queue(
+        self, gateway, counting_handler, make_heartbeat
+    ):
         """Processing drains all events from queue."""
-        handler = AsyncMock()
+        handler = counting_handler()
         gateway.register_handler(EventType.HEARTBEAT, handler)
 
-        for i in range(5):
-            event = EventFactory.create_heartbeat(
+        events = [
+            make_heartbeat(
                 session_id="test_session",
                 portfolio_ids=[f"P{i}"],
             )
-            await gateway.submit(event)
+            for i in range(5)
+        ]
+        await asyncio.gather(*(gateway.submit(e) for e in events))
 
         await gateway.process_session("test_session")
 
-        assert handler.call_count == 5
+        assert len(handler.calls) == 5
         assert gateway._queues["test_session"].empty()
 
     @pytest.mark.asyncio
-    async def test_process_respects_priority(self, gateway):
+    @pytest.mark.parametrize("priorities_in,priorities_out", PRIORITY_CASES)
+    async def test_process_respects_priority(
+        self, gateway, priorities_in, priorities_out, event_with_priority
+    ):
         """Events are processed in priority order."""
         processed_order = []
 
@@ -397,36 +472,78 @@ class TestGatewayProcessing:
         gateway.register_handler(EventType.HEARTBEAT, tracking_handler)
 
         # Submit in mixed order
-        await gateway.submit(EventFactory.create_heartbeat(
-            session_id="test_session",
-            portfolio_ids=["P1"],
-            priority=2,
-        ))
-        await gateway.submit(EventFactory.create_market_event(
-            session_id="test_session",
-            affected_sectors=["Tech"],
-            magnitude=-0.05,
-            description="Urgent",
-            priority=10,
-        ))
-        await gateway.submit(EventFactory.create_heartbeat(
-            session_id="test_session",
-            portfolio_ids=["P2"],
-            priority=5,
-        ))
+        for i, priority in enumerate(priorities_in):
+            await gateway.submit(event_with_priority("test_session", priority, i))
 
         await gateway.process_session("test_session")
 
-        assert processed_order == [10, 5, 2]
+        assert processed_order == priorities_out
+
+    @pytest.mark.asyncio
+    async def test_drain_session_batched(self, gateway, event_with_priority):
+        """drain_session processes every queued event in priority order."""
+        processed_order = []
+
+        async def tracking_handler(event):
+            processed_order.append(event.priority)
+            if event.priority == 9:
+                raise RuntimeError("Handler failed")
+
+        gateway.register_handler(EventType.MARKET_EVENT, tracking_handler)
+        gateway.register_handler(EventType.HEARTBEAT, tracking_handler)
+
+        for i, priority in enumerate([2, 9, 5]):
+            await gateway.submit(event_with_priority("test_session", priority, i))
+
+        drained = await gateway.drain_session("test_session")
+
+        # Failing handler doesn't stop the rest of the batch
+        assert drained == 3
+        assert processed_order == [9, 5, 2]
+        assert gateway._queues["test_session"].empty()
+
+    @pytest.mark.asyncio
+    async def test_drain_unknown_session(self, gateway):
+        """Draining a session without a queue returns 0."""
+        assert await gateway.drain_session("nonexistent_session") == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_mid_drain_keeps_pending_events(
+        self, gateway, make_heartbeat
+    ):
+        """Cancelling processing leaves undispatched events queued."""
+        processed = []
+
+        async def slow_handler(event):
+            await asyncio.sleep(0.05)
+            processed.append(event.event_id)
+
+        gateway.register_handler(EventType.HEARTBEAT, slow_handler)
+
+        for i in range(5):
+            await gateway.submit(make_heartbeat(
+                session_id="test_session",
+                portfolio_ids=[f"P{i}"],
+            ))
+
+        task = asyncio.create_task(gateway.process_session("test_session"))
+        await asyncio.sleep(0.07)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # One finished, one was in flight when cancelled, three still queued
+        assert len(processed) == 1
+        assert gateway._queues["test_session"].qsize() == 3
 
 
 class TestGatewayStats:
     """Tests for gateway statistics."""
 
     @pytest.mark.asyncio
-    async def test_get_stats(self, gateway):
+    async def test_get_stats(self, gateway, make_heartbeat):
         """Test gateway statistics."""
-        event = EventFactory.create_heartbeat(
+        event = make_heartbeat(
             session_id="test_session",
             portfolio_ids=["P1"],
         )
@@ -439,14 +556,16 @@ class TestGatewayStats:
         assert stats["is_running"] is True
 
     @pytest.mark.asyncio
-    async def test_get_queue_stats(self, gateway):
+    async def test_get_queue_stats(self, gateway, make_heartbeat):
         """Test queue statistics."""
-        for i in range(3):
-            event = EventFactory.create_heartbeat(
+        events = [
+            make_heartbeat(
                 session_id="test_session",
                 portfolio_ids=[f"P{i}"],
             )
-            await gateway.submit(event)
+            for i in range(3)
+        ]
+        await asyncio.gather(*(gateway.submit(e) for e in events))
 
         stats = gateway.get_queue_stats()
 
@@ -454,14 +573,16 @@ class TestGatewayStats:
         assert stats["test_session"]["pending"] == 3
 
     @pytest.mark.asyncio
-    async def test_clear_queue(self, gateway):
+    async def test_clear_queue(self, gateway, make_heartbeat):
         """Test clearing a session queue."""
-        for i in range(5):
-            event = EventFactory.create_heartbeat(
+        events = [
+            make_heartbeat(
                 session_id="test_session",
                 portfolio_ids=[f"P{i}"],
             )
-            await gateway.submit(event)
+            for i in range(5)
+        ]
+        await asyncio.gather(*(gateway.submit(e) for e in events))
 
         cleared = gateway.clear_queue("test_session")
 
@@ -476,6 +597,7 @@ class TestGatewayStats:
 class TestGatewayScheduler:
     """Tests for scheduler functionality."""
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_schedule_heartbeat(self, gateway_with_scheduler):
         """Test scheduling a heartbeat."""
@@ -490,6 +612,7 @@ class TestGatewayScheduler:
         stats = gateway_with_scheduler.get_stats()
         assert stats["scheduled_jobs"] == 1
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_schedule_cron_job(self, gateway_with_scheduler):
         """Test scheduling a cron job."""
@@ -502,6 +625,7 @@ class TestGatewayScheduler:
 
         assert job_id.startswith("cron_daily_review_")
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_cancel_job(self, gateway_with_scheduler):
         """Test cancelling a scheduled job."""
@@ -550,7 +674,7 @@ class TestEventFactory:
         assert "NVDA" in event.affected_tickers
         assert event.event_id.startswith("mkt_")
 
-    def test_create_heartbeat(self):
+    def test_create_heartbeat(self, frozen_now):
         """Test heartbeat creation."""
         event = EventFactory.create_heartbeat(
             session_id="advisor:main",
@@ -558,6 +682,7 @@ class TestEventFactory:
         )
 
         assert event.event_type == EventType.HEARTBEAT
+        assert event.timestamp == frozen_now
         assert len(event.portfolio_ids) == 2
         assert event.event_id.startswith("hb_")
 
@@ -594,34 +719,19 @@ class TestGatewayLifecycle:
     """Tests for gateway lifecycle management."""
 
     @pytest.mark.asyncio
-    async def test_start_stop(self):
-        """Test gateway start and stop."""
-        gateway = Gateway(enable_scheduler=False)
-
-        await gateway.start()
-        assert gateway._is_running is True
-
-        await gateway.stop()
-        assert gateway._is_running is False
-
-    @pytest.mark.asyncio
-    async def test_double_start(self):
-        """Double start is idempotent."""
-        gateway = Gateway(enable_scheduler=False)
-
-        await gateway.start()
-        await gateway.start()  # Should not raise
-
-        assert gateway._is_running is True
-        await gateway.stop()
-
-    @pytest.mark.asyncio
-    async def test_double_stop(self):
-        """Double stop is idempotent."""
-        gateway = Gateway(enable_scheduler=False)
-
-        await gateway.start()
-        await gateway.stop()
-        await gateway.stop()  # Should not raise
-
-        assert gateway._is_running is False
+    @pytest.mark.parametrize(
+        "actions,expected_running",
+        [
+            (["start"], True),
+            (["start", "stop"], False),
+            (["start", "start"], True),  # Double start is idempotent
+            (["start", "stop", "stop"], False),  # Double stop is idempotent
+        ],
+        ids=["start", "start_stop", "double_start", "double_stop"],
+    )
+    async def test_lifecycle(self, idle_gateway, actions, expected_running):
+        """Test gateway start/stop sequences."""
+        for action in actions:
+            await getattr(idle_gateway, action)()
+
+        assert idle_gateway._is_running is expected_running
@@ -7,6 +7,7 @@ Reference: docs/IMPLEMENTATION_PLAN.md Phase 1, Security Tests
 """
 
 import pytest
+import json
 import tempfile
 from pathlib import Path
 from datetime import datetime, timezone
@@ -179,6 +180,71 @@ class TestChainIntegrity:
 
         assert merkle_chain.verify_integrity() is False
 
+    def test_incremental_verify_only_hashes_new_blocks(self, merkle_chain, monkeypatch):
+        """Test that incremental verification starts at the checkpoint."""
+        for _ in range(5):
+            merkle_chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": "test"
+            })
+        assert merkle_chain.verify_integrity() is True
+
+        for _ in range(2):
+            merkle_chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": "test"
+            })
+
+        verified = []
+        original_verify = MerkleBlock.verify
+
+        def recording_verify(block):
+            verified.append(block.index)
+            return original_verify(block)
+
+        monkeypatch.setattr(MerkleBlock, "verify", recording_verify)
+
+        assert merkle_chain.verify_integrity(incremental=True) is True
+        assert verified == [6, 7]
+
+    def test_incremental_verify_detects_tampered_tail(self, merkle_chain):
+        """Test that blocks appended after the checkpoint are verified."""
+        merkle_chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "test"
+        })
+        assert merkle_chain.verify_integrity() is True
+
+        merkle_chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "original_action"
+        })
+        merkle_chain._blocks[2].action = "tampered_action"
+
+        assert merkle_chain.verify_integrity(incremental=True) is False
+
+    def test_incremental_verify_rechecks_replaced_checkpoint(self, merkle_chain):
+        """Test fallback to a full pass when the checkpoint hash changed."""
+        merkle_chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "test"
+        })
+        assert merkle_chain.verify_integrity() is True
+
+        merkle_chain._blocks[1].current_hash = "0" * 64
+
+        assert merkle_chain.verify_integrity(incremental=True) is False
+
 
 class TestBlockVerification:
     """Test individual block verification."""
@@ -209,6 +275,59 @@ class TestBlockVerification:
 
         assert block.verify() is False
 
+    def test_block_verify_fails_tampered_timestamp(self, merkle_chain):
+        """Test that replacing a verified block's timestamp is detected."""
+        merkle_chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "test"
+        })
+
+        block = merkle_chain.get_block(1)
+        assert block.verify() is True
+
+        block.timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        assert block.verify() is False
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {},
+            {"resource": None, "note": "Ünïcödé \"quoted\"\n"},
+            {"resource": "UHNW_001", "nested": {"b": [1, 2.5, None], "a": True}},
+            {"when": datetime(2024, 1, 15, tzinfo=timezone.utc)},
+            {"resource": 42, "flag": False},
+            {"resource": True},
+        ],
+        ids=["minimal", "unicode", "nested", "non_json_value", "int_resource", "bool_resource"],
+    )
+    def test_canonical_payload_matches_json_dumps(self, merkle_chain, extra):
+        """Test that the hashed payload is unchanged from the JSON encoding."""
+        merkle_chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "test",
+            **extra,
+        })
+
+        block = merkle_chain.get_block(1)
+        expected = json.dumps({
+            "index": block.index,
+            "event_id": block.event_id,
+            "timestamp": block.timestamp.isoformat(),
+            "event_type": block.event_type,
+            "session_id": block.session_id,
+            "actor": block.actor,
+            "action": block.action,
+            "resource": block.resource,
+            "data": block.data,
+            "previous_hash": block.previous_hash,
+        }, sort_keys=True, default=str)
+
+        assert block._canonical_payload() == expected
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # QUERY TESTS
@@ -248,6 +367,10 @@ class TestChainQueries:
         assert block is not None
         assert block.current_hash == hash
 
+    def test_get_block_by_unknown_hash(self, merkle_chain):
+        """Test that an unknown hash returns None."""
+        assert merkle_chain.get_block_by_hash("f" * 64) is None
+
     def test_get_blocks_by_session(self, merkle_chain):
         """Test filtering blocks by session."""
         merkle_chain.add_block({
@@ -292,6 +415,10 @@ class TestChainQueries:
         )
         assert len(transition_blocks) == 1
 
+        # Plain string values and unseen types are accepted too
+        assert merkle_chain.get_blocks_by_event_type("agent_invoked")[0].action == "invoke"
+        assert merkle_chain.get_blocks_by_event_type(AuditEventType.TRADE_APPROVED) == []
+
     def test_get_root_hash(self, merkle_chain):
         """Test getting root hash."""
         hash = merkle_chain.add_block({
@@ -330,6 +457,61 @@ class TestChainPersistence:
         assert loaded_chain.get_root_hash() == chain.get_root_hash()
         assert loaded_chain.verify_integrity() is True
 
+    def test_loaded_blocks_share_link_hashes(self, temp_chain_file):
+        """Test that loaded links reuse the predecessor's hash string."""
+        chain = MerkleChain(persistence_path=temp_chain_file)
+        for _ in range(3):
+            chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": "test"
+            })
+        chain.persist()
+
+        loaded = MerkleChain(persistence_path=temp_chain_file)
+
+        for i in range(1, len(loaded)):
+            assert loaded.get_block(i).previous_hash is loaded.get_block(i - 1).current_hash
+
+    def test_queries_after_load(self, temp_chain_file):
+        """Test that lookups work on a chain loaded from disk."""
+        chain = MerkleChain(persistence_path=temp_chain_file)
+        hash = chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "loaded_session",
+            "actor": "test",
+            "action": "test_action"
+        })
+        chain.persist()
+
+        loaded_chain = MerkleChain(persistence_path=temp_chain_file)
+
+        assert loaded_chain.get_block_by_hash(hash).index == 1
+        assert [b.index for b in loaded_chain.get_blocks_by_session("loaded_session")] == [1]
+        assert [b.index for b in loaded_chain.get_blocks_by_event_type(
+            AuditEventType.STATE_TRANSITION
+        )] == [1]
+
+    def test_persist_and_load_non_finite_floats(self, temp_chain_file):
+        """Test that values only the stdlib parser accepts still load."""
+        chain = MerkleChain(persistence_path=temp_chain_file)
+        chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "test_action",
+            "drift": float("nan"),
+            "limit": float("inf"),
+            "big": 2 ** 70,
+        })
+        chain.persist()
+
+        loaded_chain = MerkleChain(persistence_path=temp_chain_file)
+
+        assert loaded_chain.get_root_hash() == chain.get_root_hash()
+        assert loaded_chain.get_block(1).data["big"] == 2 ** 70
+
     def test_auto_persist(self, temp_chain_file):
         """Test auto-persist mode."""
         chain = MerkleChain(
@@ -348,6 +530,114 @@ class TestChainPersistence:
         loaded = MerkleChain(persistence_path=temp_chain_file)
         assert len(loaded) == 2  # Genesis + 1 block
 
+    def test_auto_persist_appends_to_log(self, temp_chain_file):
+        """Test that blocks after the first snapshot go to the append log."""
+        chain = MerkleChain(
+            persistence_path=temp_chain_file,
+            auto_persist=True
+        )
+        for i in range(3):
+            chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": f"action_{i}"
+            })
+
+        # Snapshot holds genesis + first block; the rest are logged
+        assert '"block_count": 2' in temp_chain_file.read_text()
+        assert len(chain.log_path.read_text().splitlines()) == 2
+
+        loaded = MerkleChain(persistence_path=temp_chain_file)
+        assert len(loaded) == 4
+        assert loaded.get_root_hash() == chain.get_root_hash()
+
+        # A manual snapshot folds the log back in
+        chain.persist()
+        assert not chain.log_path.exists()
+        assert len(MerkleChain(persistence_path=temp_chain_file)) == 4
+
+    def test_partial_log_record_is_ignored(self, temp_chain_file):
+        """Test that an interrupted trailing log write is skipped on load."""
+        chain = MerkleChain(
+            persistence_path=temp_chain_file,
+            auto_persist=True
+        )
+        for _ in range(2):
+            chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": "test"
+            })
+
+        with open(chain.log_path, "a") as f:
+            f.write('{"index": 3, "event_')
+        size = chain.log_path.stat().st_size
+
+        # Loading and verifying only read the log
+        assert verify_chain_file(temp_chain_file, quick=True) is True
+        loaded = MerkleChain(persistence_path=temp_chain_file, auto_persist=True)
+        assert len(loaded) == 3
+        assert loaded.verify_integrity() is True
+        assert chain.log_path.stat().st_size == size
+
+        # The next append truncates the fragment, so the log stays loadable
+        loaded.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "after-crash"
+        })
+
+        reloaded = MerkleChain(persistence_path=temp_chain_file)
+        assert len(reloaded) == 4
+        assert reloaded.verify_integrity() is True
+        assert verify_chain_file(temp_chain_file) is True
+
+    def test_stale_log_after_snapshot_is_skipped(self, temp_chain_file):
+        """Test that log records already in the snapshot are skipped on load."""
+        chain = MerkleChain(
+            persistence_path=temp_chain_file,
+            auto_persist=True
+        )
+        for i in range(3):
+            chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": f"action_{i}"
+            })
+
+        # Simulate a crash between writing the snapshot and removing the log
+        log = chain.log_path.read_bytes()
+        chain.persist()
+        chain.log_path.write_bytes(log)
+
+        loaded = MerkleChain(persistence_path=temp_chain_file)
+        assert len(loaded) == 4
+        assert loaded.get_root_hash() == chain.get_root_hash()
+        assert verify_chain_file(temp_chain_file) is True
+
+    def test_tampered_log_fails_verification(self, temp_chain_file):
+        """Test that tampering with the append log is detected."""
+        chain = MerkleChain(
+            persistence_path=temp_chain_file,
+            auto_persist=True
+        )
+        for _ in range(2):
+            chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": "test"
+            })
+
+        content = chain.log_path.read_text()
+        chain.log_path.write_text(content.replace('"action": "test"', '"action": "tampered"'))
+
+        assert verify_chain_file(temp_chain_file) is False
+
     def test_verify_chain_file(self, temp_chain_file):
         """Test chain file verification."""
         chain = MerkleChain(persistence_path=temp_chain_file)
@@ -385,6 +675,45 @@ class TestChainPersistence:
         with pytest.raises(ValueError, match="failed integrity check"):
             MerkleChain(persistence_path=temp_chain_file)
 
+    def test_quick_verify_uses_checksum(self, temp_chain_file):
+        """Test that quick verification catches a corrupted snapshot."""
+        chain = MerkleChain(persistence_path=temp_chain_file)
+        chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "test"
+        })
+        chain.persist()
+        assert verify_chain_file(temp_chain_file, quick=True) is True
+
+        raw = bytearray(temp_chain_file.read_bytes())
+        raw[10] ^= 0x01  # Flip one bit in the JSON body
+        temp_chain_file.write_bytes(bytes(raw))
+
+        assert verify_chain_file(temp_chain_file, quick=True) is False
+        assert verify_chain_file(temp_chain_file) is False
+
+    def test_loads_snapshot_without_checksum(self, temp_chain_file):
+        """Test that snapshots written before the checksum trailer load."""
+        chain = MerkleChain(persistence_path=temp_chain_file)
+        chain.add_block({
+            "event_type": AuditEventType.STATE_TRANSITION.value,
+            "session_id": "test",
+            "actor": "test",
+            "action": "test"
+        })
+        temp_chain_file.write_text(json.dumps({
+            "version": "1.0",
+            "block_count": len(chain),
+            "root_hash": chain.get_root_hash(),
+            "blocks": chain.export_chain(),
+        }, indent=2, default=str))
+
+        loaded = MerkleChain(persistence_path=temp_chain_file)
+        assert loaded.get_root_hash() == chain.get_root_hash()
+        assert verify_chain_file(temp_chain_file, quick=True) is True
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # EXPORT TESTS
@@ -421,6 +750,21 @@ class TestChainExport:
         assert len(events) == 1  # Excludes genesis
         assert events[0].event_type == AuditEventType.STATE_TRANSITION
 
+    def test_iter_audit_events_streams(self, merkle_chain):
+        """Test that audit events are produced lazily, in chain order."""
+        for action in ("first", "second"):
+            merkle_chain.add_block({
+                "event_type": AuditEventType.STATE_TRANSITION.value,
+                "session_id": "test",
+                "actor": "test",
+                "action": action
+            })
+
+        events = merkle_chain.iter_audit_events()
+
+        assert not isinstance(events, list)
+        assert [e.action for e in events] == ["first", "second"]
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # ITERATION TESTS
@@ -9,23 +9,22 @@ Tests cover:
 - Persona router
 - Canvas generation
 - UI components
+
+src.agents (and the Anthropic SDK behind it) is imported inside the tests
+and fixtures that use it, so UI and routing tests collect without it.
 """
 
 import pytest
+from collections import Counter
 from datetime import datetime, timezone, timedelta
-import json
+from unittest.mock import patch
 
 from src.contracts.schemas import (
     Portfolio,
-    Holding,
-    TaxLot,
-    ClientProfile,
-    TargetAllocation,
     RiskProfile,
     Transaction,
     TradeAction,
     RecommendedTrade,
-    InputEvent,
     EventType,
     MarketEventInput,
     HeartbeatInput,
@@ -40,21 +39,11 @@ from src.contracts.schemas import (
     TaxOpportunityType,
     Severity,
 )
-from src.agents import (
-    OfflineCoordinator,
-    OfflineDriftAnalyzer,
-    OfflineTaxAnalyzer,
-    ConflictDetector,
-    ScenarioGenerator,
-)
 from src.routing import (
     PersonaRouter,
-    RoutingDecision,
     RoutingPriority,
-    route_event,
 )
 from src.ui import (
-    CanvasGenerator,
     generate_canvas,
     components,
     Badge,
@@ -67,103 +56,141 @@ from src.ui import (
     ButtonVariant,
 )
 from src.security import MerkleChain
+import src.routing.persona_router as router_module
+
+
+# Reference time for every fixture and test in this module. Taken once at
+# import (not a fixed date) because wash-sale windows and holding periods
+# are measured against the wall clock inside the agents.
+NOW = datetime.now(timezone.utc)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
-# FIXTURES
+# HELPERS
 # ═══════════════════════════════════════════════════════════════════════════
 
-@pytest.fixture
-def sample_portfolio():
-    """Create a sample portfolio with concentration risk."""
-    now = datetime.now(timezone.utc)
+def assert_all_present(html: str, needles, ignore_case: bool = False) -> None:
+    """
+    Assert every needle occurs in html, reporting all missing at once.
 
-    return Portfolio(
-        portfolio_id="test_001",
-        client_id="client_001",
-        name="Test Growth Portfolio",
-        aum_usd=50_000_000,
-        client_profile=ClientProfile(
-            client_id="client_001",
-            risk_tolerance=RiskProfile.MODERATE_GROWTH,
-            tax_sensitivity=0.8,
-            concentration_limit=0.15,
-            rebalancing_frequency="quarterly"
-        ),
-        target_allocation=TargetAllocation(
-            us_equities=0.60,
-            international_equities=0.15,
-            fixed_income=0.15,
-            alternatives=0.05,
-            structured_products=0.03,
-            cash=0.02
-        ),
-        holdings=[
-            Holding(
-                ticker="NVDA",
-                name="NVIDIA Corporation",
-                quantity=15000,
-                current_price=900.0,
-                market_value=13_500_000,
-                cost_basis=8_000_000,
-                unrealized_gain_loss=5_500_000,
-                portfolio_weight=0.27,
-                asset_class="US Equities",
-                sector="Technology",
-                tax_lots=[
-                    TaxLot(
-                        lot_id="lot_1",
-                        purchase_date=now - timedelta(days=400),
-                        purchase_price=400.0,
-                        quantity=10000,
-                        cost_basis=4_000_000
-                    ),
-                    TaxLot(
-                        lot_id="lot_2",
-                        purchase_date=now - timedelta(days=180),
-                        purchase_price=600.0,
-                        quantity=5000,
-                        cost_basis=3_000_000
-                    )
-                ]
-            ),
-            Holding(
-                ticker="AAPL",
-                name="Apple Inc.",
-                quantity=20000,
-                current_price=180.0,
-                market_value=3_600_000,
-                cost_basis=4_000_000,
-                unrealized_gain_loss=-400_000,
-                portfolio_weight=0.072,
-                asset_class="US Equities",
-                sector="Technology",
-                tax_lots=[]
-            ),
-            Holding(
-                ticker="BND",
-                name="Vanguard Total Bond Market ETF",
-                quantity=100000,
-                current_price=74.0,
-                market_value=7_400_000,
-                cost_basis=8_000_000,
-                unrealized_gain_loss=-600_000,
-                portfolio_weight=0.148,
-                asset_class="Fixed Income",
-                sector="Bonds",
-                tax_lots=[]
-            )
-        ],
-        cash_available=500_000,
-        last_rebalance=now - timedelta(days=45)
-    )
+    With ignore_case, html is lowercased once for the whole batch rather
+    than once per probe.
+    """
+    if ignore_case:
+        html = html.lower()
+        missing = [needle for needle in needles if needle.lower() not in html]
+    else:
+        missing = [needle for needle in needles if needle not in html]
+    assert not missing, f"missing from HTML: {missing}"
 
 
-@pytest.fixture
-def sample_transactions():
-    """Create sample recent transactions."""
-    now = datetime.now(timezone.utc)
+def index_scenarios(scenarios) -> dict:
+    """Key scenarios by the first word of their title, lowercased."""
+    return {s.title.split()[0].lower(): s for s in scenarios}
+
 
+# ═══════════════════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Plain-data holdings for sample_portfolio, validated in one
+# Portfolio.model_validate call rather than per-model constructors.
+_HOLDINGS = [
+    {
+        "ticker": "NVDA",
+        "name": "NVIDIA Corporation",
+        "quantity": 15000,
+        "current_price": 900.0,
+        "market_value": 13_500_000,
+        "cost_basis": 8_000_000,
+        "unrealized_gain_loss": 5_500_000,
+        "portfolio_weight": 0.27,
+        "asset_class": "US Equities",
+        "sector": "Technology",
+        "tax_lots": [
+            {
+                "lot_id": "lot_1",
+                "purchase_date": NOW - timedelta(days=400),
+                "purchase_price": 400.0,
+                "quantity": 10000,
+                "cost_basis": 4_000_000,
+            },
+            {
+                "lot_id": "lot_2",
+                "purchase_date": NOW - timedelta(days=180),
+                "purchase_price": 600.0,
+                "quantity": 5000,
+                "cost_basis": 3_000_000,
+            },
+        ],
+    },
+    {
+        "ticker": "AAPL",
+        "name": "Apple Inc.",
+        "quantity": 20000,
+        "current_price": 180.0,
+        "market_value": 3_600_000,
+        "cost_basis": 4_000_000,
+        "unrealized_gain_loss": -400_000,
+        "portfolio_weight": 0.072,
+        "asset_class": "US Equities",
+        "sector": "Technology",
+        "tax_lots": [],
+    },
+    {
+        "ticker": "BND",
+        "name": "Vanguard Total Bond Market ETF",
+        "quantity": 100000,
+        "current_price": 74.0,
+        "market_value": 7_400_000,
+        "cost_basis": 8_000_000,
+        "unrealized_gain_loss": -600_000,
+        "portfolio_weight": 0.148,
+        "asset_class": "Fixed Income",
+        "sector": "Bonds",
+        "tax_lots": [],
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def sample_portfolio():
+    """Create a sample portfolio with concentration risk (read-only)."""
+    return Portfolio.model_validate({
+        "portfolio_id": "test_001",
+        "client_id": "client_001",
+        "name": "Test Growth Portfolio",
+        "aum_usd": 50_000_000,
+        "client_profile": {
+            "client_id": "client_001",
+            "risk_tolerance": RiskProfile.MODERATE_GROWTH,
+            "tax_sensitivity": 0.8,
+            "concentration_limit": 0.15,
+            "rebalancing_frequency": "quarterly",
+        },
+        "target_allocation": {
+            "us_equities": 0.60,
+            "international_equities": 0.15,
+            "fixed_income": 0.15,
+            "alternatives": 0.05,
+            "structured_products": 0.03,
+            "cash": 0.02,
+        },
+        "holdings": _HOLDINGS,
+        "cash_available": 500_000,
+        "last_rebalance": NOW - timedelta(days=45),
+    })
+
+
+@pytest.fixture(scope="module")
+def minimal_portfolio(sample_portfolio):
+    """Sample portfolio without holdings, so analysis has nothing to trade."""
+    return sample_portfolio.model_copy(update={"holdings": []})
+
+
+@pytest.fixture(scope="module")
+def sample_transactions():
+    """Create sample recent transactions (read-only)."""
     return [
         Transaction(
             transaction_id="tx_001",
@@ -172,7 +199,7 @@ def sample_transactions():
             action=TradeAction.SELL,
             quantity=5000,
             price=175.0,
-            timestamp=now - timedelta(days=20)
+            timestamp=NOW - timedelta(days=20)
         ),
         Transaction(
             transaction_id="tx_002",
@@ -181,19 +208,19 @@ def sample_transactions():
             action=TradeAction.BUY,
             quantity=2000,
             price=400.0,
-            timestamp=now - timedelta(days=10)
+            timestamp=NOW - timedelta(days=10)
         )
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_event():
-    """Create a sample market event with high magnitude."""
+    """Create a sample market event with high magnitude (read-only)."""
     return MarketEventInput(
         event_id="evt_001",
         event_type=EventType.MARKET_EVENT,
         session_id="test_session",
-        timestamp=datetime.now(timezone.utc),
+        timestamp=NOW,
         priority=8,
         affected_sectors=["Technology"],
         magnitude=-0.12,  # 12% drop - critical
@@ -202,12 +229,12 @@ def sample_event():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_drift_output():
-    """Create sample drift agent output."""
+    """Create sample drift agent output (read-only)."""
     return DriftAgentOutput(
         portfolio_id="test_001",
-        analysis_timestamp=datetime.now(timezone.utc),
+        analysis_timestamp=NOW,
         drift_detected=True,
         concentration_risks=[
             ConcentrationRisk(
@@ -248,18 +275,16 @@ def sample_drift_output():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_tax_output():
-    """Create sample tax agent output with wash sale."""
-    now = datetime.now(timezone.utc)
-
+    """Create sample tax agent output with wash sale (read-only)."""
     return TaxAgentOutput(
         portfolio_id="test_001",
-        analysis_timestamp=now,
+        analysis_timestamp=NOW,
         wash_sale_violations=[
             WashSaleViolation(
                 ticker="AAPL",
-                prior_sale_date=now - timedelta(days=20),
+                prior_sale_date=NOW - timedelta(days=20),
                 days_since_sale=20,
                 disallowed_loss=100000,
                 recommendation="Wait 11 more days before buying AAPL"
@@ -288,6 +313,94 @@ def sample_tax_output():
     )
 
 
+@pytest.fixture(scope="module")
+def baseline_conflicts(sample_portfolio, sample_drift_output, sample_tax_output):
+    """
+    Detect conflicts once per module between the sample agent outputs.
+
+    Returns (conflicts, counts by conflict_type, conflict by conflict_type);
+    the by-type map holds the last conflict seen for each type.
+    """
+    from src.agents import ConflictDetector
+
+    conflicts = ConflictDetector.detect_conflicts(
+        sample_drift_output,
+        sample_tax_output,
+        sample_portfolio
+    )
+    return (
+        conflicts,
+        Counter(c.conflict_type for c in conflicts),
+        {c.conflict_type: c for c in conflicts},
+    )
+
+
+@pytest.fixture(scope="module")
+def generated_scenarios(
+    sample_portfolio,
+    sample_drift_output,
+    sample_tax_output,
+    baseline_conflicts
+):
+    """Generate scenarios once per module from the sample agent outputs."""
+    from src.agents import ScenarioGenerator
+
+    conflicts, _, _ = baseline_conflicts
+    return ScenarioGenerator.generate_scenarios(
+        sample_drift_output,
+        sample_tax_output,
+        conflicts,
+        sample_portfolio
+    )
+
+
+@pytest.fixture(scope="module")
+def scenarios_index(generated_scenarios):
+    """Generated scenarios keyed by kind ("optimal", "tax", "risk", ...)."""
+    return index_scenarios(generated_scenarios)
+
+
+@pytest.fixture
+def mutable_drift_output(sample_drift_output):
+    """Per-test deep copy of the drift output for tests that modify it."""
+    return sample_drift_output.model_copy(deep=True)
+
+
+@pytest.fixture
+def patched_loader(monkeypatch, sample_portfolio):
+    """Make the persona router load the sample portfolio for any ID."""
+    monkeypatch.setattr(router_module, "load_portfolio", lambda _: sample_portfolio)
+
+
+@pytest.fixture(scope="module")
+def analysis_result(sample_portfolio):
+    """Run the offline coordinator once per module on the sample portfolio."""
+    from src.agents import OfflineCoordinator
+    return OfflineCoordinator().execute_analysis(sample_portfolio)
+
+
+@pytest.fixture(scope="module")
+def analysis_result_with_tx(sample_portfolio, sample_transactions):
+    """Run the offline coordinator once per module with recent transactions."""
+    from src.agents import OfflineCoordinator
+    return OfflineCoordinator().execute_analysis(
+        sample_portfolio,
+        sample_transactions
+    )
+
+
+@pytest.fixture(scope="module")
+def rendered_canvas(analysis_result):
+    """Render the canvas once per module as (result, html)."""
+    return analysis_result, generate_canvas(analysis_result)
+
+
+@pytest.fixture(scope="module")
+def rendered_canvas_with_tx(analysis_result_with_tx):
+    """Render the with-transactions canvas once per module as (result, html)."""
+    return analysis_result_with_tx, generate_canvas(analysis_result_with_tx)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFLICT DETECTOR TESTS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -295,49 +408,43 @@ def sample_tax_output():
 class TestConflictDetector:
     """Tests for ConflictDetector."""
 
-    def test_detect_wash_sale_conflict(
-        self,
-        sample_portfolio,
-        sample_drift_output,
-        sample_tax_output
-    ):
+    def test_detect_wash_sale_conflict(self, baseline_conflicts):
         """Test detection of wash sale conflicts."""
-        conflicts = ConflictDetector.detect_conflicts(
-            sample_drift_output,
-            sample_tax_output,
-            sample_portfolio
-        )
+        _, counts, by_type = baseline_conflicts
 
         # Should detect AAPL wash sale conflict
-        wash_conflicts = [c for c in conflicts if c.conflict_type == "WASH_SALE_CONFLICT"]
-        assert len(wash_conflicts) == 1
-        assert "AAPL" in wash_conflicts[0].description
+        assert counts["WASH_SALE_CONFLICT"] == 1
+        assert "AAPL" in by_type["WASH_SALE_CONFLICT"].description
 
     def test_detect_tax_inefficient_conflict(
         self,
         sample_portfolio,
-        sample_drift_output,
+        mutable_drift_output,
         sample_tax_output
     ):
         """Test detection of tax-inefficient trades."""
+        from src.agents import ConflictDetector
+
         # Modify drift output to have lower urgency NVDA sell
-        sample_drift_output.recommended_trades[0].urgency = 5
+        mutable_drift_output.recommended_trades[0].urgency = 5
 
         conflicts = ConflictDetector.detect_conflicts(
-            sample_drift_output,
+            mutable_drift_output,
             sample_tax_output,
             sample_portfolio
         )
 
         # Should detect tax-inefficient conflict for NVDA
-        tax_conflicts = [c for c in conflicts if c.conflict_type == "TAX_INEFFICIENT"]
-        assert len(tax_conflicts) >= 1
+        counts = Counter(c.conflict_type for c in conflicts)
+        assert counts["TAX_INEFFICIENT"] >= 1
 
     def test_no_conflicts_when_clean(self, sample_portfolio):
         """Test no conflicts when outputs are clean."""
+        from src.agents import ConflictDetector
+
         drift = DriftAgentOutput(
             portfolio_id="test_001",
-            analysis_timestamp=datetime.now(timezone.utc),
+            analysis_timestamp=NOW,
             drift_detected=False,
             concentration_risks=[],
             drift_metrics=[],
@@ -348,7 +455,7 @@ class TestConflictDetector:
 
         tax = TaxAgentOutput(
             portfolio_id="test_001",
-            analysis_timestamp=datetime.now(timezone.utc),
+            analysis_timestamp=NOW,
             wash_sale_violations=[],
             tax_opportunities=[],
             proposed_trades_analysis=[],
@@ -368,58 +475,21 @@ class TestConflictDetector:
 class TestScenarioGenerator:
     """Tests for ScenarioGenerator."""
 
-    def test_generate_scenarios(
-        self,
-        sample_portfolio,
-        sample_drift_output,
-        sample_tax_output
-    ):
+    def test_generate_scenarios(self, generated_scenarios):
         """Test scenario generation."""
-        conflicts = ConflictDetector.detect_conflicts(
-            sample_drift_output,
-            sample_tax_output,
-            sample_portfolio
-        )
-
-        scenarios = ScenarioGenerator.generate_scenarios(
-            sample_drift_output,
-            sample_tax_output,
-            conflicts,
-            sample_portfolio
-        )
-
         # Should generate 2-4 scenarios
-        assert 2 <= len(scenarios) <= 4
+        assert 2 <= len(generated_scenarios) <= 4
 
         # Each scenario should have required fields
-        for scenario in scenarios:
+        for scenario in generated_scenarios:
             assert scenario.scenario_id
             assert scenario.title
             assert scenario.description
             assert scenario.expected_outcomes
 
-    def test_optimal_scenario_avoids_wash_sales(
-        self,
-        sample_portfolio,
-        sample_drift_output,
-        sample_tax_output
-    ):
+    def test_optimal_scenario_avoids_wash_sales(self, scenarios_index):
         """Test that optimal scenario avoids wash sales."""
-        conflicts = ConflictDetector.detect_conflicts(
-            sample_drift_output,
-            sample_tax_output,
-            sample_portfolio
-        )
-
-        scenarios = ScenarioGenerator.generate_scenarios(
-            sample_drift_output,
-            sample_tax_output,
-            conflicts,
-            sample_portfolio
-        )
-
-        # Find optimal scenario
-        optimal = next(s for s in scenarios if "Optimal" in s.title)
+        optimal = scenarios_index["optimal"]
 
         # Should not have AAPL BUY action (wash sale risk)
         aapl_buys = [
@@ -435,6 +505,8 @@ class TestScenarioGenerator:
         sample_tax_output
     ):
         """Test that tax-efficient scenario includes loss harvesting."""
+        from src.agents import ScenarioGenerator
+
         conflicts = []
 
         scenarios = ScenarioGenerator.generate_scenarios(
@@ -445,7 +517,7 @@ class TestScenarioGenerator:
         )
 
         # Find tax-efficient scenario
-        tax_scenario = next(s for s in scenarios if "Tax" in s.title)
+        tax_scenario = index_scenarios(scenarios)["tax"]
 
         # Expected outcomes should show tax savings
         assert tax_scenario.expected_outcomes.get("harvest_opportunities_captured", 0) > 0
@@ -460,6 +532,8 @@ class TestOfflineCoordinator:
 
     def test_execute_analysis(self, sample_portfolio, sample_transactions):
         """Test full analysis execution."""
+        from src.agents import OfflineCoordinator
+
         coordinator = OfflineCoordinator()
 
         result = coordinator.execute_analysis(
@@ -474,46 +548,39 @@ class TestOfflineCoordinator:
         assert len(result.scenarios) >= 2
         assert result.recommended_scenario_id
 
-    def test_scenarios_are_scored(self, sample_portfolio):
+    def test_scenarios_are_scored(self, analysis_result):
         """Test that scenarios have utility scores."""
-        coordinator = OfflineCoordinator()
-
-        result = coordinator.execute_analysis(sample_portfolio)
-
         # All scenarios should have utility scores
-        for scenario in result.scenarios:
+        for scenario in analysis_result.scenarios:
             assert scenario.utility_score is not None
             assert 0 <= scenario.utility_score.total_score <= 100
 
-    def test_scenarios_are_ranked(self, sample_portfolio):
+    def test_scenarios_are_ranked(self, analysis_result):
         """Test that scenarios are sorted by score."""
-        coordinator = OfflineCoordinator()
-
-        result = coordinator.execute_analysis(sample_portfolio)
-
-        scores = [s.utility_score.total_score for s in result.scenarios]
+        scores = [s.utility_score.total_score for s in analysis_result.scenarios]
         assert scores == sorted(scores, reverse=True)
 
-    def test_recommended_is_top_scored(self, sample_portfolio):
+    def test_recommended_is_top_scored(self, analysis_result):
         """Test that recommended scenario is top scored."""
-        coordinator = OfflineCoordinator()
-
-        result = coordinator.execute_analysis(sample_portfolio)
-
-        recommended = result.recommended_scenario
+        recommended = analysis_result.recommended_scenario
         assert recommended is not None
         assert recommended.utility_score.rank == 1
 
-    def test_merkle_logging(self, sample_portfolio):
+    def test_merkle_logging(self, minimal_portfolio):
         """Test that analysis is logged to Merkle chain."""
+        from src.agents import OfflineCoordinator
+
+        # Private chain: no test in this module shares Merkle state, so the
+        # file can be distributed across xdist workers
         chain = MerkleChain()
-        initial_length = len(chain)
 
         coordinator = OfflineCoordinator(merkle_chain=chain)
-        coordinator.execute_analysis(sample_portfolio)
+        with patch.object(chain, "add_block", wraps=chain.add_block) as spy:
+            result = coordinator.execute_analysis(minimal_portfolio)
 
         # Should have added a block
-        assert len(chain) > initial_length
+        assert spy.call_count == 1
+        assert result.merkle_hash == chain.get_root_hash()
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -523,73 +590,51 @@ class TestOfflineCoordinator:
 class TestPersonaRouter:
     """Tests for PersonaRouter."""
 
-    def test_route_market_event_high_magnitude(self, sample_portfolio, sample_event):
+    def test_route_market_event_high_magnitude(self, patched_loader, sample_event):
         """Test routing of high-magnitude market event."""
         router = PersonaRouter()
 
-        # Mock load_portfolio
-        import src.routing.persona_router as router_module
-        original_load = router_module.load_portfolio
-        router_module.load_portfolio = lambda x: sample_portfolio
+        decision = router.route(sample_event, "test_001")
 
-        try:
-            decision = router.route(sample_event, "test_001")
+        assert decision.should_process
+        assert decision.priority == RoutingPriority.CRITICAL
+        assert decision.requires_coordinator
 
-            assert decision.should_process
-            assert decision.priority == RoutingPriority.CRITICAL
-            assert decision.requires_coordinator
-        finally:
-            router_module.load_portfolio = original_load
-
-    def test_route_heartbeat_with_concentration(self, sample_portfolio):
+    def test_route_heartbeat_with_concentration(self, patched_loader):
         """Test routing of heartbeat when concentration risk exists."""
         router = PersonaRouter()
 
-        import src.routing.persona_router as router_module
-        original_load = router_module.load_portfolio
-        router_module.load_portfolio = lambda x: sample_portfolio
-
-        try:
-            event = HeartbeatInput(
-                event_id="hb_001",
-                event_type=EventType.HEARTBEAT,
-                session_id="test_session",
-                timestamp=datetime.now(timezone.utc),
-                portfolio_ids=["test_001"]
-            )
+        event = HeartbeatInput(
+            event_id="hb_001",
+            event_type=EventType.HEARTBEAT,
+            session_id="test_session",
+            timestamp=NOW,
+            portfolio_ids=["test_001"]
+        )
 
-            decision = router.route(event, "test_001")
+        decision = router.route(event, "test_001")
 
-            assert decision.should_process
-            assert "concentration_alert" in decision.context_additions or \
-                   "drift_detected" in decision.context_additions
-        finally:
-            router_module.load_portfolio = original_load
+        assert decision.should_process
+        assert "concentration_alert" in decision.context_additions or \
+               "drift_detected" in decision.context_additions
 
-    def test_route_webhook_trade_execution(self, sample_portfolio):
+    def test_route_webhook_trade_execution(self, patched_loader):
         """Test routing of trade execution webhook."""
         router = PersonaRouter()
 
-        import src.routing.persona_router as router_module
-        original_load = router_module.load_portfolio
-        router_module.load_portfolio = lambda x: sample_portfolio
-
-        try:
-            event = WebhookInput(
-                event_id="wh_001",
-                event_type=EventType.WEBHOOK,
-                session_id="test_session",
-                timestamp=datetime.now(timezone.utc),
-                source="trading_system",
-                payload={"type": "trade_execution", "trade": {"ticker": "NVDA"}}
-            )
+        event = WebhookInput(
+            event_id="wh_001",
+            event_type=EventType.WEBHOOK,
+            session_id="test_session",
+            timestamp=NOW,
+            source="trading_system",
+            payload={"type": "trade_execution", "trade": {"ticker": "NVDA"}}
+        )
 
-            decision = router.route(event, "test_001")
+        decision = router.route(event, "test_001")
 
-            assert decision.should_process
-            assert decision.priority == RoutingPriority.HIGH
-        finally:
-            router_module.load_portfolio = original_load
+        assert decision.should_process
+        assert decision.priority == RoutingPriority.HIGH
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -599,63 +644,37 @@ class TestPersonaRouter:
 class TestCanvasGenerator:
     """Tests for CanvasGenerator."""
 
-    def test_generate_canvas(self, sample_portfolio):
-        """Test canvas generation."""
-        coordinator = OfflineCoordinator()
-        result = coordinator.execute_analysis(sample_portfolio)
-
-        html = generate_canvas(result)
-
-        assert "<!DOCTYPE html>" in html
-        assert sample_portfolio.portfolio_id in html
-        assert "sentinel-canvas" in html
-
-    def test_canvas_includes_scenarios(self, sample_portfolio):
+    def test_generate_canvas(self, sample_portfolio, rendered_canvas):
+        """Test canvas structure, recommended highlight and design tokens."""
+        _, html = rendered_canvas
+
+        assert_all_present(html, [
+            "<!DOCTYPE html>",
+            sample_portfolio.portfolio_id,
+            "sentinel-canvas",
+            # Recommended badge and CSS class
+            "Recommended",
+            "recommended",
+            # Design tokens
+            "--s-obsidian-900",
+            "--s-champagne-500",
+            "Cormorant Garamond",
+        ])
+
+    def test_canvas_includes_scenarios(self, rendered_canvas):
         """Test that canvas includes all scenarios."""
-        coordinator = OfflineCoordinator()
-        result = coordinator.execute_analysis(sample_portfolio)
+        result, html = rendered_canvas
 
-        html = generate_canvas(result)
-
-        for scenario in result.scenarios:
-            assert scenario.title in html
-
-    def test_canvas_highlights_recommended(self, sample_portfolio):
-        """Test that recommended scenario is highlighted."""
-        coordinator = OfflineCoordinator()
-        result = coordinator.execute_analysis(sample_portfolio)
-
-        html = generate_canvas(result)
+        assert_all_present(html, [scenario.title for scenario in result.scenarios])
 
-        # Recommended badge should appear
-        assert "Recommended" in html
-        assert "recommended" in html  # CSS class
-
-    def test_canvas_shows_conflicts(self, sample_portfolio, sample_transactions):
+    def test_canvas_shows_conflicts(self, rendered_canvas_with_tx):
         """Test that canvas shows conflicts when present."""
-        coordinator = OfflineCoordinator()
-        result = coordinator.execute_analysis(
-            sample_portfolio,
-            sample_transactions
-        )
-
-        html = generate_canvas(result)
+        result, html = rendered_canvas_with_tx
 
         if result.conflicts_detected:
             assert "conflicts-panel" in html
             assert "Conflicts Detected" in html
 
-    def test_canvas_includes_design_tokens(self, sample_portfolio):
-        """Test that canvas includes design tokens."""
-        coordinator = OfflineCoordinator()
-        result = coordinator.execute_analysis(sample_portfolio)
-
-        html = generate_canvas(result)
-
-        assert "--s-obsidian-900" in html
-        assert "--s-champagne-500" in html
-        assert "Cormorant Garamond" in html
-
 
 # ═══════════════════════════════════════════════════════════════════════════
 # UI COMPONENTS TESTS
@@ -664,76 +683,58 @@ class TestCanvasGenerator:
 class TestUIComponents:
     """Tests for UI components."""
 
-    def test_badge_render(self):
-        """Test badge component rendering."""
-        badge = Badge(text="CRITICAL", variant=BadgeVariant.DANGER)
-        html = badge.render()
-
-        assert "CRITICAL" in html
-        assert "sentinel-badge" in html
-        assert "negative" in html.lower()
-
-    def test_button_render(self):
-        """Test button component rendering."""
-        button = Button(
-            text="Approve",
-            variant=ButtonVariant.PRIMARY,
-            onclick="approve()"
-        )
-        html = button.render()
-
-        assert "Approve" in html
-        assert "approve()" in html
-        assert "sentinel-btn" in html
-
-    def test_score_bar_render(self):
-        """Test score bar component rendering."""
-        bar = ScoreBar(value=75, label="Utility Score")
-
-        html = bar.render()
-
-        assert "75" in html
-        assert "Utility Score" in html
-        assert "width: 75%" in html
-
-    def test_metric_card_render(self):
-        """Test metric card component rendering."""
-        metric = MetricCard(
-            label="Total AUM",
-            value="$50M",
-            change=5.2
-        )
-        html = metric.render()
-
-        assert "Total AUM" in html
-        assert "$50M" in html
-        assert "5.2%" in html
-
-    def test_trade_row_render(self):
-        """Test trade row component rendering."""
-        trade = TradeRow(
-            ticker="NVDA",
-            action="SELL",
-            quantity=3000,
-            price=900.0
-        )
-        html = trade.render()
-
-        assert "NVDA" in html
-        assert "SELL" in html
-        assert "3,000" in html
-        assert "negative" in html.lower()
-
-    def test_alert_banner_render(self):
-        """Test alert banner component rendering."""
-        alert = AlertBanner(
-            message="Wash sale detected",
-            variant="warning"
-        )
-        html = alert.render()
+    @pytest.mark.parametrize(
+        "factory, expected, expected_any_case",
+        [
+            (
+                lambda: Badge(text="CRITICAL", variant=BadgeVariant.DANGER),
+                ["CRITICAL", "sentinel-badge"],
+                ["negative"],
+            ),
+            (
+                lambda: Button(
+                    text="Approve",
+                    variant=ButtonVariant.PRIMARY,
+                    onclick="approve()"
+                ),
+                ["Approve", "approve()", "sentinel-btn"],
+                [],
+            ),
+            (
+                lambda: ScoreBar(value=75, label="Utility Score"),
+                ["75", "Utility Score", "width: 75%"],
+                [],
+            ),
+            (
+                lambda: MetricCard(label="Total AUM", value="$50M", change=5.2),
+                ["Total AUM", "$50M", "5.2%"],
+                [],
+            ),
+            (
+                lambda: TradeRow(
+                    ticker="NVDA",
+                    action="SELL",
+                    quantity=3000,
+                    price=900.0
+                ),
+                ["NVDA", "SELL", "3,000"],
+                ["negative"],
+            ),
+            (
+                lambda: AlertBanner(message="Wash sale detected", variant="warning"),
+                ["Wash sale detected"],
+                ["warning"],
+            ),
+        ],
+        ids=["badge", "button", "score_bar", "metric_card", "trade_row", "alert_banner"],
+    )
+    def test_component_render(self, factory, expected, expected_any_case):
+        """Test that each component renders its content and styling hooks."""
+        html = factory().render()
 
-        assert "Wash sale detected" in html
-        assert "warning" in html.lower()
+        assert_all_present(html, expected)
+        if expected_any_case:
+            assert_all_present(html, expected_any_case, ignore_case=True)
 
     def test_component_factory(self):
         """Test component factory methods."""
@@ -756,6 +757,8 @@ class TestPhase3Integration:
 
     def test_full_pipeline(self, sample_portfolio, sample_transactions):
         """Test complete analysis pipeline."""
+        from src.agents import OfflineCoordinator
+
         # 1. Run coordinator
         coordinator = OfflineCoordinator()
         result = coordinator.execute_analysis(
@@ -773,36 +776,21 @@ class TestPhase3Integration:
         assert result.recommended_scenario_id in html
         assert "Approve" in html
 
-    def test_routing_to_coordinator(self, sample_portfolio, sample_event):
+    def test_routing_to_coordinator(self, patched_loader, sample_event):
         """Test routing decision leads to coordinator."""
         router = PersonaRouter()
 
-        import src.routing.persona_router as router_module
-        original_load = router_module.load_portfolio
-        router_module.load_portfolio = lambda x: sample_portfolio
-
-        try:
-            decision = router.route(sample_event, "test_001")
+        decision = router.route(sample_event, "test_001")
 
-            # High-impact event should require coordinator
-            assert decision.requires_coordinator
+        # High-impact event should require coordinator
+        assert decision.requires_coordinator
 
-            # Context should include market event
-            assert "market_event" in decision.context_additions
-        finally:
-            router_module.load_portfolio = original_load
+        # Context should include market event
+        assert "market_event" in decision.context_additions
 
-    def test_conflict_resolution_in_scenarios(
-        self,
-        sample_portfolio,
-        sample_transactions
-    ):
+    def test_conflict_resolution_in_scenarios(self, analysis_result_with_tx):
         """Test that conflicts are addressed in scenarios."""
-        coordinator = OfflineCoordinator()
-        result = coordinator.execute_analysis(
-            sample_portfolio,
-            sample_transactions
-        )
+        result = analysis_result_with_tx
 
         # If there are conflicts, scenarios should address them
         if result.conflicts_detected:
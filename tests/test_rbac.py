@@ -162,6 +162,23 @@ class TestSessionConfig:
         assert analyst_session.can_access_portfolio("portfolio_b")
         assert not analyst_session.can_access_portfolio("portfolio_c")
 
+    def test_allowed_portfolios_coerced_to_frozenset(self, analyst_session):
+        """Portfolio allow-lists are stored as frozensets."""
+        assert analyst_session.allowed_portfolios == frozenset(
+            {"portfolio_a", "portfolio_b"}
+        )
+
+    def test_analyst_session_from_composed_sets(self, analyst_session):
+        """Allow-lists compose with set algebra and pass straight through."""
+        desk = frozenset({"portfolio_b", "portfolio_c"})
+        session = create_analyst_session(
+            session_id="analyst-002",
+            allowed_portfolios=analyst_session.allowed_portfolios & desk,
+        )
+        assert session.can_access_portfolio("portfolio_b")
+        assert not session.can_access_portfolio("portfolio_a")
+        assert not session.can_access_portfolio("portfolio_c")
+
     def test_session_has_permission(self, advisor_session):
         """has_permission checks role permissions."""
         assert advisor_session.has_permission(Permission.READ_HOLDINGS)
@@ -171,6 +188,20 @@ class TestSessionConfig:
         """Analyst lacks approval permission."""
         assert not analyst_session.has_permission(Permission.APPROVE_TRADES)
 
+    def test_has_permission_accepts_raw_mask(self, analyst_session):
+        """has_permission accepts a Permission's int value."""
+        assert analyst_session.has_permission(Permission.READ_HOLDINGS.value)
+        assert not analyst_session.has_permission(Permission.APPROVE_TRADES.value)
+
+    def test_has_permission_follows_role_change(self, analyst_session):
+        """Reassigning the role changes the permissions checked."""
+        analyst_session.role = Role.ADMIN
+        assert analyst_session.has_permission(Permission.APPROVE_TRADES)
+
+        analyst_session.role = Role.DRIFT_AGENT
+        assert analyst_session.has_permission(Permission.READ_HOLDINGS)
+        assert not analyst_session.has_permission(Permission.READ_RECOMMENDATIONS)
+
     def test_session_requires_sandbox(self, analyst_session, advisor_session):
         """Analyst requires sandbox, advisor does not."""
         assert analyst_session.requires_sandbox
@@ -186,6 +217,18 @@ class TestSessionConfig:
         )
         assert session.is_expired
 
+    def test_is_expired_at(self):
+        """is_expired_at compares against the supplied time."""
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        session = SessionConfig(
+            session_id="test",
+            session_type=SessionType.ADVISOR_MAIN,
+            role=Role.HUMAN_ADVISOR,
+            expires_at=expires_at
+        )
+        assert not session.is_expired_at(expires_at)
+        assert session.is_expired_at(expires_at + timedelta(seconds=1))
+
     def test_validate_access_raises_on_expired(self):
         """validate_access raises for expired session."""
         session = SessionConfig(
@@ -237,6 +280,25 @@ class TestRBACService:
         )
         assert result is False
 
+    def test_check_permission_registered_session(self, rbac_service, analyst_session):
+        """Registered sessions are checked against their role's mask."""
+        rbac_service.register_session(analyst_session)
+
+        assert rbac_service.check_permission(analyst_session, Permission.READ_HOLDINGS)
+        assert not rbac_service.check_permission(analyst_session, Permission.APPROVE_TRADES)
+
+    def test_check_permission_follows_in_place_downgrade(
+        self, rbac_service, advisor_session
+    ):
+        """Downgrading a registered session's role revokes access immediately."""
+        rbac_service.register_session(advisor_session)
+        assert rbac_service.check_permission(advisor_session, Permission.READ_TAX_LOTS)
+
+        advisor_session.role = Role.CLIENT
+
+        assert not advisor_session.has_permission(Permission.READ_TAX_LOTS)
+        assert not rbac_service.check_permission(advisor_session, Permission.READ_TAX_LOTS)
+
     def test_enforce_permission_success(self, rbac_service, advisor_session):
         """enforce_permission succeeds for valid permission."""
         # Should not raise
@@ -334,6 +396,76 @@ class TestSecurityContext:
 
         assert merkle_chain.get_block_count() > initial_count
 
+    def test_context_is_slotted(self, advisor_session):
+        """SecurityContext carries no per-instance __dict__."""
+        ctx = SecurityContext(session=advisor_session)
+        assert not hasattr(ctx, "__dict__")
+
+    def test_context_batches_access_log(self, advisor_session, merkle_chain):
+        """Batched contexts write one block per full batch and on flush."""
+        ctx = SecurityContext(
+            session=advisor_session,
+            audit_chain=merkle_chain,
+            access_batch_size=3
+        )
+        initial_count = merkle_chain.get_block_count()
+
+        for portfolio_id in ("portfolio_a", "portfolio_b", "portfolio_c"):
+            ctx.log_access(portfolio_id, "read")
+        assert merkle_chain.get_block_count() == initial_count + 1
+        block_data = merkle_chain.blocks[-1]["data"]
+        assert [a["resource"] for a in block_data["accesses"]] == [
+            "portfolio_a", "portfolio_b", "portfolio_c"
+        ]
+        # Mixed batches have no single top-level resource
+        assert block_data["resource"] is None
+
+        ctx.log_access("portfolio_d", "read")
+        assert merkle_chain.get_block_count() == initial_count + 1
+
+        ctx.flush()
+        assert merkle_chain.get_block_count() == initial_count + 2
+        assert merkle_chain.blocks[-1]["data"]["resource"] == "portfolio_d"
+        ctx.flush()
+        assert merkle_chain.get_block_count() == initial_count + 2
+
+    def test_context_exit_flushes_on_error(self, advisor_session, merkle_chain):
+        """Leaving a batched context flushes pending accesses, even on error."""
+        initial_count = merkle_chain.get_block_count()
+
+        with pytest.raises(RuntimeError):
+            with SecurityContext(
+                session=advisor_session,
+                audit_chain=merkle_chain,
+                access_batch_size=10
+            ) as ctx:
+                ctx.log_access("portfolio_a", "read")
+                ctx.log_access("portfolio_a", "write")
+                raise RuntimeError("unit of work failed")
+
+        assert merkle_chain.get_block_count() == initial_count + 1
+        block_data = merkle_chain.blocks[-1]["data"]
+        assert block_data["resource"] == "portfolio_a"
+        assert [a["action"] for a in block_data["accesses"]] == ["read", "write"]
+
+    def test_context_denial_flushes_pending_access(self, analyst_session, merkle_chain):
+        """Pending accesses are written before a denial."""
+        with SecurityContext(
+            session=analyst_session,
+            audit_chain=merkle_chain,
+            access_batch_size=10
+        ) as ctx:
+            ctx.log_access("portfolio_a", "read")
+
+            with pytest.raises(PermissionError):
+                ctx.require_permission(Permission.APPROVE_TRADES)
+
+        event_types = [b["data"]["event_type"] for b in merkle_chain.blocks[-2:]]
+        assert event_types == [
+            AuditEventType.ACCESS_GRANTED.value,
+            AuditEventType.PERMISSION_DENIED.value,
+        ]
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # DECORATOR TESTS
@@ -371,6 +503,20 @@ class TestDecorators:
         with pytest.raises(PermissionError):
             obj.approve()
 
+    def test_require_permission_decorator_admin(self, analyst_session):
+        """require_permission lets admin sessions through."""
+
+        class TestClass:
+            def __init__(self, session):
+                self._session = session
+
+            @require_permission(Permission.APPROVE_TRADES)
+            def approve(self):
+                return "success"
+
+        analyst_session.role = Role.ADMIN
+        assert TestClass(analyst_session).approve() == "success"
+
     def test_require_portfolio_access_decorator(self, analyst_session):
         """require_portfolio_access decorator enforces portfolio access."""
 
@@ -391,6 +537,19 @@ class TestDecorators:
         with pytest.raises(PermissionError):
             obj.get_portfolio("portfolio_c")
 
+        # Keyword argument is checked too
+        with pytest.raises(PermissionError):
+            obj.get_portfolio(portfolio_id="portfolio_c")
+
+    def test_require_portfolio_access_rejects_other_first_arg(self):
+        """require_portfolio_access refuses methods not taking portfolio_id first."""
+        with pytest.raises(TypeError, match="portfolio_id"):
+
+            class TestClass:
+                @require_portfolio_access
+                def get_price(self, ticker, portfolio_id):
+                    return ticker
+
     def test_require_permissions_multiple(self, advisor_session):
         """require_permissions decorator checks multiple permissions."""
 
@@ -405,6 +564,21 @@ class TestDecorators:
         obj = TestClass(advisor_session)
         assert obj.read_full_data() == "success"
 
+    def test_require_permissions_names_missing(self, analyst_session):
+        """require_permissions reports the permission the session lacks."""
+
+        class TestClass:
+            def __init__(self, session):
+                self._session = session
+
+            @require_permissions(Permission.READ_HOLDINGS, Permission.READ_TAX_LOTS)
+            def read_full_data(self):
+                return "success"
+
+        obj = TestClass(analyst_session)
+        with pytest.raises(PermissionError, match="READ_TAX_LOTS"):
+            obj.read_full_data()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # SESSION MANAGER TESTS
@@ -446,6 +620,18 @@ class TestSessionManager:
         assert result is True
         assert session_manager.get_session(session.session_id) is None
 
+    def test_expire_session_logs_once(self, session_manager, merkle_chain):
+        """Expiring an already-removed session is a no-op."""
+        session = session_manager.create_session(
+            session_type=SessionType.ADVISOR_MAIN,
+            role=Role.HUMAN_ADVISOR
+        )
+        session_manager._expire_session(session.session_id)
+        block_count = merkle_chain.get_block_count()
+
+        session_manager._expire_session(session.session_id)
+        assert merkle_chain.get_block_count() == block_count
+
     def test_record_tool_call(self, session_manager):
         """Tool calls are recorded."""
         session = session_manager.create_session(
@@ -488,6 +674,10 @@ class TestSessionManager:
         assert stats["total_sessions"] == 2
         assert stats["active_sessions"] == 2
         assert stats["sandboxed_sessions"] == 1
+        assert stats["sessions_by_type"][SessionType.ANALYST.value] == 1
+        assert stats["sessions_by_type"][SessionType.CLIENT_PORTAL.value] == 0
+        assert stats["sessions_by_role"][Role.HUMAN_ADVISOR.value] == 1
+        assert stats["sessions_by_role"][Role.ADMIN.value] == 0
 
 
 class TestSessionContext:
@@ -528,6 +718,30 @@ class TestSessionMetrics:
         assert data["tool_calls"] == 5
         assert data["permission_denials"] == 1
 
+    def test_next_tool_call_is_distinct_across_threads(self):
+        """Concurrent tool calls each get a distinct sequence number."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        metrics = SessionMetrics()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            numbers = list(pool.map(lambda _: metrics.next_tool_call(), range(200)))
+
+        assert sorted(numbers) == list(range(1, 201))
+
+    def test_next_tool_call_continues_from_initial_count(self):
+        """Sequence numbering picks up after a tool_calls passed in."""
+        metrics = SessionMetrics(tool_calls=5)
+
+        assert metrics.next_tool_call() == 6
+        assert metrics.tool_calls == 6
+
+    def test_metrics_are_slotted(self):
+        """Metrics carry no per-instance __dict__."""
+        metrics = SessionMetrics()
+        assert not hasattr(metrics, "__dict__")
+        with pytest.raises(AttributeError):
+            metrics.unknown_counter = 1
+
 
 class TestLocalSandbox:
     """Local sandbox tests."""
@@ -545,6 +759,20 @@ class TestLocalSandbox:
         assert result["status"] == "success"
         assert result["result"] == 42
 
+    @pytest.mark.asyncio
+    async def test_execute_awaits_coroutines(self, advisor_session):
+        """Local sandbox awaits coroutine functions and returned coroutines."""
+        sandbox = LocalSandbox()
+
+        async def async_code():
+            return 7
+
+        result = await sandbox.execute(advisor_session, async_code)
+        assert result["result"] == 7
+
+        result = await sandbox.execute(advisor_session, lambda: async_code())
+        assert result["result"] == 7
+
     @pytest.mark.asyncio
     async def test_execute_error(self, advisor_session):
         """Local sandbox catches errors."""
@@ -583,3 +811,19 @@ class TestSingletons:
         manager2 = get_session_manager()
 
         assert manager1 is manager2
+
+    def test_singleton_ignores_later_arguments(self, merkle_chain):
+        """Arguments only configure the first call; later calls get the same instance."""
+        reset_rbac_service()
+        reset_session_manager()
+
+        service = get_rbac_service()
+        manager = get_session_manager()
+
+        assert get_rbac_service(audit_chain=merkle_chain) is service
+        assert get_session_manager(audit_chain=merkle_chain) is manager
+        assert service._audit_chain is None
+        assert manager._audit_chain is None
+
+        reset_rbac_service()
+        reset_session_manager()
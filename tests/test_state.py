@@ -4,13 +4,17 @@ Tests for Sentinel State Machine and Utility Function.
 Reference: docs/IMPLEMENTATION_PLAN.md Phase 2, Steps 2.5-2.6
 """
 
+import json
 import pytest
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timezone
+from pydantic import ValidationError
 
 from src.contracts.schemas import (
     SystemState,
     Scenario,
     ActionStep,
+    ExpectedOutcomes,
     TradeAction,
     UtilityWeights,
     Portfolio,
@@ -30,7 +34,10 @@ from src.state.utility import (
     UtilityFunction,
     UtilityFunctionFactory,
     ScoringConfig,
+    Ranking,
     score_and_rank,
+    price_lookup,
+    CostScorer,
 )
 
 
@@ -53,9 +60,9 @@ def state_machine_with_merkle(merkle_chain):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_portfolio():
-    """Create a sample portfolio for utility testing."""
+    """Create a sample portfolio for utility testing (read-only, shared)."""
     return Portfolio(
         portfolio_id="test-portfolio",
         client_id="client-001",
@@ -104,9 +111,9 @@ def sample_portfolio():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_scenarios():
-    """Create sample scenarios for utility testing."""
+    """Create sample scenarios for utility testing (read-only, shared)."""
     return [
         Scenario(
             scenario_id="scenario-001",
@@ -130,18 +137,18 @@ def sample_scenarios():
                     rationale="Maintain tech exposure",
                 ),
             ],
-            expected_outcomes={
-                "concentration_before": 0.17,
-                "concentration_after": 0.10,
-                "tax_impact": -5000,
-                "diversification_delta": 0.05,
-                "drift_before": 0.05,
-                "drift_after": 0.02,
-                "target_alignment": 0.8,
-                "risk_profile_alignment": 0.7,
-                "addresses_urgent_issues": True,
-                "issue_urgency": 7,
-            },
+            expected_outcomes=ExpectedOutcomes(
+                concentration_before=0.17,
+                concentration_after=0.10,
+                tax_impact=-5000,
+                diversification_delta=0.05,
+                drift_before=0.05,
+                drift_after=0.02,
+                target_alignment=0.8,
+                risk_profile_alignment=0.7,
+                addresses_urgent_issues=True,
+                issue_urgency=7,
+            ),
             risks=["Market timing risk", "AMD volatility"],
         ),
         Scenario(
@@ -149,18 +156,18 @@ def sample_scenarios():
             title="Hold Position",
             description="Maintain current positions",
             action_steps=[],
-            expected_outcomes={
-                "concentration_before": 0.17,
-                "concentration_after": 0.17,
-                "tax_impact": 0,
-                "diversification_delta": 0,
-                "drift_before": 0.05,
-                "drift_after": 0.05,
-                "target_alignment": 0.5,
-                "risk_profile_alignment": 0.5,
-                "addresses_urgent_issues": False,
-                "issue_urgency": 3,
-            },
+            expected_outcomes=ExpectedOutcomes(
+                concentration_before=0.17,
+                concentration_after=0.17,
+                tax_impact=0,
+                diversification_delta=0,
+                drift_before=0.05,
+                drift_after=0.05,
+                target_alignment=0.5,
+                risk_profile_alignment=0.5,
+                addresses_urgent_issues=False,
+                issue_urgency=3,
+            ),
             risks=["Continued concentration risk"],
         ),
         Scenario(
@@ -177,23 +184,35 @@ def sample_scenarios():
                     rationale="Partial concentration reduction",
                 ),
             ],
-            expected_outcomes={
-                "concentration_before": 0.17,
-                "concentration_after": 0.135,
-                "tax_impact": 10000,  # Tax cost
-                "diversification_delta": 0.02,
-                "drift_before": 0.05,
-                "drift_after": 0.03,
-                "target_alignment": 0.65,
-                "risk_profile_alignment": 0.6,
-                "addresses_urgent_issues": True,
-                "issue_urgency": 6,
-            },
+            expected_outcomes=ExpectedOutcomes(
+                concentration_before=0.17,
+                concentration_after=0.135,
+                tax_impact=10000,  # Tax cost
+                diversification_delta=0.02,
+                drift_before=0.05,
+                drift_after=0.03,
+                target_alignment=0.65,
+                risk_profile_alignment=0.6,
+                addresses_urgent_issues=True,
+                issue_urgency=6,
+            ),
             risks=["Still above concentration limit"],
         ),
     ]
 
 
+@pytest.fixture(scope="module")
+def default_utility_fn():
+    """Shared default-config utility function (stateless between calls)."""
+    return UtilityFunction()
+
+
+@pytest.fixture(scope="module")
+def moderate_weights():
+    """Moderate-growth utility weights."""
+    return UTILITY_WEIGHTS_BY_PROFILE[RiskProfile.MODERATE_GROWTH]
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # STATE MACHINE TESTS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -227,75 +246,45 @@ class TestStateMachineBasic:
         assert state_machine.session_id == "test-session-001"
 
 
-class TestStateMachineTransitions:
-    """State transition tests."""
-
-    def test_detect_event_transition(self, state_machine):
-        """MONITOR → DETECT via detect_event trigger."""
-        result = state_machine.detect_event()
-        assert result is True
-        assert state_machine.get_state() == SystemState.DETECT.value
-
-    def test_full_happy_path(self, state_machine):
-        """Complete transition through all states."""
-        # MONITOR → DETECT
-        state_machine.detect_event()
-        assert state_machine.get_state() == SystemState.DETECT.value
-
-        # DETECT → ANALYZE
-        state_machine.start_analysis()
-        assert state_machine.get_state() == SystemState.ANALYZE.value
-
-        # ANALYZE → RECOMMEND (no conflict)
-        state_machine.no_conflict()
-        assert state_machine.get_state() == SystemState.RECOMMEND.value
-
-        # RECOMMEND → APPROVED
-        state_machine.approve()
-        assert state_machine.get_state() == SystemState.APPROVED.value
-
-        # APPROVED → EXECUTE
-        state_machine.execute()
-        assert state_machine.get_state() == SystemState.EXECUTE.value
-
-        # EXECUTE → MONITOR (complete cycle)
-        state_machine.complete()
-        assert state_machine.get_state() == SystemState.MONITOR.value
-
-    def test_conflict_resolution_path(self, state_machine):
-        """Path through CONFLICT_RESOLUTION state."""
-        state_machine.detect_event()
-        state_machine.start_analysis()
-
-        # ANALYZE → CONFLICT_RESOLUTION
-        state_machine.detect_conflict()
-        assert state_machine.get_state() == SystemState.CONFLICT_RESOLUTION.value
-
-        # CONFLICT_RESOLUTION → RECOMMEND
-        state_machine.resolve_conflict()
-        assert state_machine.get_state() == SystemState.RECOMMEND.value
+# Trigger sequences from MONITOR and the state each one ends in. Every
+# prefix of the happy path is listed so intermediate states stay covered.
+_HAPPY_PATH = (
+    ("detect_event", SystemState.DETECT),
+    ("start_analysis", SystemState.ANALYZE),
+    ("no_conflict", SystemState.RECOMMEND),
+    ("approve", SystemState.APPROVED),
+    ("execute", SystemState.EXECUTE),
+    ("complete", SystemState.MONITOR),
+)
 
-    def test_reject_recommendation(self, state_machine):
-        """Rejection returns to MONITOR."""
-        state_machine.detect_event()
-        state_machine.start_analysis()
-        state_machine.no_conflict()
+TRANSITION_PATHS = [
+    (tuple(t for t, _ in _HAPPY_PATH[:i + 1]), state)
+    for i, (_, state) in enumerate(_HAPPY_PATH)
+] + [
+    (("detect_event", "start_analysis", "detect_conflict"),
+     SystemState.CONFLICT_RESOLUTION),
+    (("detect_event", "start_analysis", "detect_conflict", "resolve_conflict"),
+     SystemState.RECOMMEND),
+    (("detect_event", "start_analysis", "no_conflict", "reject"),
+     SystemState.MONITOR),
+    (("detect_event", "start_analysis", "no_conflict", "approve", "execute", "abort"),
+     SystemState.MONITOR),
+]
 
-        # RECOMMEND → MONITOR via reject
-        state_machine.reject()
-        assert state_machine.get_state() == SystemState.MONITOR.value
 
-    def test_abort_from_execute(self, state_machine):
-        """Abort from EXECUTE returns to MONITOR."""
-        state_machine.detect_event()
-        state_machine.start_analysis()
-        state_machine.no_conflict()
-        state_machine.approve()
-        state_machine.execute()
+class TestStateMachineTransitions:
+    """State transition tests."""
 
-        # EXECUTE → MONITOR via abort
-        state_machine.abort()
-        assert state_machine.get_state() == SystemState.MONITOR.value
+    @pytest.mark.parametrize(
+        "triggers,final",
+        TRANSITION_PATHS,
+        ids=lambda v: "-".join(v) if isinstance(v, tuple) else v.value,
+    )
+    def test_path(self, state_machine, triggers, final):
+        """Each trigger sequence succeeds and lands in the expected state."""
+        for trigger in triggers:
+            assert getattr(state_machine, trigger)() is True
+        assert state_machine.get_state() == final.value
 
     def test_transition_method_with_metadata(self, state_machine):
         """transition() method works with metadata."""
@@ -311,6 +300,18 @@ class TestStateMachineTransitions:
         with pytest.raises(InvalidTransitionError):
             state_machine.transition(SystemState.EXECUTE.value)
 
+    def test_invalid_trigger_raises(self, state_machine):
+        """Firing a trigger not valid in the current state raises and keeps state."""
+        with pytest.raises(InvalidTransitionError):
+            state_machine.approve()
+        assert state_machine.get_state() == SystemState.MONITOR.value
+        assert state_machine.get_transition_history() == []
+
+    def test_unknown_initial_state_rejected(self):
+        """Constructing with an unknown state fails fast."""
+        with pytest.raises(ValueError):
+            SentinelStateMachine(session_id="test", initial_state="bogus")
+
 
 class TestStateMachineHistory:
     """Transition history tests."""
@@ -329,13 +330,26 @@ class TestStateMachineHistory:
         assert len(history) == 2
 
         # Check first transition
-        assert history[0]["from_state"] == SystemState.MONITOR.value
-        assert history[0]["to_state"] == SystemState.DETECT.value
-        assert history[0]["trigger"] == "detect_event"
+        assert history[0].from_state == SystemState.MONITOR.value
+        assert history[0].to_state == SystemState.DETECT.value
+        assert history[0].trigger == "detect_event"
 
         # Check second transition
-        assert history[1]["from_state"] == SystemState.DETECT.value
-        assert history[1]["to_state"] == SystemState.ANALYZE.value
+        assert history[1].from_state == SystemState.DETECT.value
+        assert history[1].to_state == SystemState.ANALYZE.value
+
+        # Records serialize at the edge
+        assert history[0].to_dict()["trigger"] == "detect_event"
+
+    def test_history_is_a_snapshot(self, state_machine):
+        """Returned history is a copy; records hash by identity."""
+        state_machine.detect_event()
+        history = state_machine.get_transition_history()
+        history.clear()
+
+        assert len(state_machine.get_transition_history()) == 1
+        record = state_machine.get_last_transition()
+        assert {record} == {state_machine.get_transition_history()[0]}
 
     def test_get_last_transition(self, state_machine):
         """get_last_transition returns most recent."""
@@ -346,65 +360,116 @@ class TestStateMachineHistory:
         assert last is not None
         assert last.to_state == SystemState.ANALYZE.value
 
+    def test_history_is_bounded(self):
+        """Only the most recent history_limit transitions are kept."""
+        sm = SentinelStateMachine(session_id="test", history_limit=2)
+        sm.detect_event()
+        sm.start_analysis()
+        sm.reset()
+
+        history = sm.get_transition_history()
+        assert [h.trigger for h in history] == ["start_analysis", "reset"]
+
+    def test_transition_records_are_immutable(self, state_machine):
+        """Recorded transitions cannot be altered after the fact."""
+        state_machine.detect_event()
+        last = state_machine.get_last_transition()
+
+        with pytest.raises(AttributeError):
+            last.to_state = SystemState.EXECUTE.value
+
     def test_get_available_triggers(self, state_machine):
         """get_available_triggers returns valid triggers for current state."""
         triggers = state_machine.get_available_triggers()
         assert "detect_event" in triggers
         assert "start_analysis" not in triggers
 
+    def test_available_triggers_match_transition_table(self, state_machine):
+        """Every state lists exactly the triggers the table allows, in order."""
+        for state in SentinelStateMachine.STATES:
+            sm = SentinelStateMachine(session_id="test", initial_state=state)
+            expected = [
+                t["trigger"] for t in SentinelStateMachine.TRANSITIONS
+                if t["source"] == state
+            ]
+            assert sm.get_available_triggers() == expected
+
+        # Callers get their own list
+        state_machine.get_available_triggers().clear()
+        assert state_machine.get_available_triggers() == ["detect_event"]
+
 
 class TestStateMachineWithMerkle:
     """Tests with Merkle chain integration."""
 
-    def test_initial_state_logged(self, state_machine_with_merkle, merkle_chain):
-        """Initial state is logged to Merkle chain."""
-        # Initial state is logged during construction
-        assert merkle_chain.get_block_count() >= 1
+    def test_initial_state_logged(self, merkle_chain):
+        """Initial state is logged to Merkle chain when log_initial is set."""
+        before = merkle_chain.get_block_count()
+        SentinelStateMachine(
+            session_id="test", merkle_chain=merkle_chain, log_initial=True
+        )
+        assert merkle_chain.get_block_count() == before + 1
+
+    def test_initial_state_not_logged_when_disabled(self, merkle_chain):
+        """log_initial=False skips the initialize block."""
+        before = merkle_chain.get_block_count()
+        factory = StateMachineFactory(merkle_chain=merkle_chain)
+        sm = factory.create("session-001", log_initial=False)
+
+        assert merkle_chain.get_block_count() == before
+
+        # Later transitions are still audited
+        sm.detect_event()
+        assert merkle_chain.get_block_count() == before + 1
 
     def test_transitions_logged(self, state_machine_with_merkle, merkle_chain):
         """Transitions are logged to Merkle chain."""
-        initial_count = merkle_chain.get_block_count()
+        before = merkle_chain.get_block_count()
 
         state_machine_with_merkle.detect_event()
 
-        assert merkle_chain.get_block_count() > initial_count
+        assert merkle_chain.get_block_count() == before + 1
+        assert merkle_chain.blocks[-1]["data"]["trigger"] == "detect_event"
+
+
+@pytest.fixture(scope="class")
+def factory(shared_merkle_chain):
+    """One state machine factory per test class."""
+    return StateMachineFactory(merkle_chain=shared_merkle_chain)
 
 
 class TestStateMachineFactory:
     """State machine factory tests."""
 
-    def test_factory_creates_machine(self, merkle_chain):
-        """Factory creates and tracks machines."""
-        factory = StateMachineFactory(merkle_chain=merkle_chain)
+    @pytest.fixture(autouse=True)
+    def _clear_factory(self, factory):
+        """Start every test with no tracked machines."""
+        factory.clear()
 
+    def test_factory_creates_machine(self, factory):
+        """Factory creates and tracks machines."""
         sm = factory.create("session-001")
         assert sm is not None
         assert sm.session_id == "session-001"
 
-    def test_factory_get_machine(self, merkle_chain):
+    def test_factory_get_machine(self, factory):
         """Factory retrieves created machines."""
-        factory = StateMachineFactory(merkle_chain=merkle_chain)
-
         factory.create("session-001")
         retrieved = factory.get("session-001")
 
         assert retrieved is not None
         assert retrieved.session_id == "session-001"
 
-    def test_factory_remove_machine(self, merkle_chain):
+    def test_factory_remove_machine(self, factory):
         """Factory can remove machines."""
-        factory = StateMachineFactory(merkle_chain=merkle_chain)
-
         factory.create("session-001")
         result = factory.remove("session-001")
 
         assert result is True
         assert factory.get("session-001") is None
 
-    def test_factory_get_all_states(self, merkle_chain):
+    def test_factory_get_all_states(self, factory):
         """Factory returns all machine states."""
-        factory = StateMachineFactory(merkle_chain=merkle_chain)
-
         factory.create("session-001")
         sm2 = factory.create("session-002")
         sm2.detect_event()
@@ -413,39 +478,45 @@ class TestStateMachineFactory:
         assert states["session-001"] == SystemState.MONITOR.value
         assert states["session-002"] == SystemState.DETECT.value
 
+    def test_factory_clear(self, factory):
+        """clear() drops every tracked machine."""
+        factory.create("session-001")
+        factory.create("session-002")
 
-class TestStateMachineHelpers:
-    """Helper method tests."""
-
-    def test_is_analyzing_states(self, state_machine):
-        """is_analyzing returns True for analysis states."""
-        assert not state_machine.is_analyzing()
+        factory.clear()
 
-        state_machine.detect_event()
-        assert state_machine.is_analyzing()
+        assert factory.get_all_states() == {}
 
-        state_machine.start_analysis()
-        assert state_machine.is_analyzing()
 
-    def test_is_pending_approval(self, state_machine):
-        """is_pending_approval for RECOMMEND state."""
-        state_machine.detect_event()
-        state_machine.start_analysis()
-        state_machine.no_conflict()
+HELPERS = ("is_idle", "is_analyzing", "is_pending_approval", "is_executing")
 
-        assert state_machine.is_pending_approval()
+# Trigger fired (None = initial state) → expected HELPERS values afterwards.
+# Goes through CONFLICT_RESOLUTION so every state is visited once.
+HELPER_MATRIX = [
+    (None,               (True,  False, False, False)),
+    ("detect_event",     (False, True,  False, False)),
+    ("start_analysis",   (False, True,  False, False)),
+    ("detect_conflict",  (False, True,  False, False)),
+    ("resolve_conflict", (False, False, True,  False)),
+    ("approve",          (False, False, False, True)),
+    ("execute",          (False, False, False, True)),
+    ("complete",         (True,  False, False, False)),
+]
 
-    def test_is_executing_states(self, state_machine):
-        """is_executing for APPROVED and EXECUTE states."""
-        state_machine.detect_event()
-        state_machine.start_analysis()
-        state_machine.no_conflict()
-        state_machine.approve()
 
-        assert state_machine.is_executing()
+class TestStateMachineHelpers:
+    """Helper method tests."""
 
-        state_machine.execute()
-        assert state_machine.is_executing()
+    def test_helpers_through_path(self, state_machine):
+        """Every is_* helper is correct at every step of a full cycle."""
+        for trigger, expected in HELPER_MATRIX:
+            if trigger is not None:
+                getattr(state_machine, trigger)()
+            for helper, value in zip(HELPERS, expected):
+                assert getattr(state_machine, helper)() is value, (
+                    f"{helper} after {trigger or 'init'} "
+                    f"(state={state_machine.get_state()})"
+                )
 
     def test_reset_to_monitor(self, state_machine):
         """reset_to_monitor from various states."""
@@ -464,15 +535,14 @@ class TestStateMachineHelpers:
 class TestUtilityFunction:
     """Utility function scoring tests."""
 
-    def test_score_single_scenario(self, sample_portfolio, sample_scenarios):
+    def test_score_single_scenario(
+        self, default_utility_fn, moderate_weights, sample_portfolio, sample_scenarios
+    ):
         """Score a single scenario."""
-        utility_fn = UtilityFunction()
-        weights = UTILITY_WEIGHTS_BY_PROFILE[RiskProfile.MODERATE_GROWTH]
-
-        score = utility_fn.score_scenario(
+        score = default_utility_fn.score_scenario(
             sample_scenarios[0],
             sample_portfolio,
-            weights
+            moderate_weights
         )
 
         assert score is not None
@@ -480,15 +550,14 @@ class TestUtilityFunction:
         assert 0 <= score.total_score <= 100
         assert len(score.dimension_scores) == 5
 
-    def test_rank_multiple_scenarios(self, sample_portfolio, sample_scenarios):
+    def test_rank_multiple_scenarios(
+        self, default_utility_fn, moderate_weights, sample_portfolio, sample_scenarios
+    ):
         """Rank multiple scenarios correctly."""
-        utility_fn = UtilityFunction()
-        weights = UTILITY_WEIGHTS_BY_PROFILE[RiskProfile.MODERATE_GROWTH]
-
-        ranked = utility_fn.rank_scenarios(
+        ranked = default_utility_fn.rank_scenarios(
             sample_scenarios,
             sample_portfolio,
-            weights
+            moderate_weights
         )
 
         assert len(ranked) == 3
@@ -500,22 +569,81 @@ class TestUtilityFunction:
         assert ranked[1].rank == 2
         assert ranked[2].rank == 3
 
+    def test_rank_matches_individual_scores(
+        self, default_utility_fn, moderate_weights, sample_portfolio, sample_scenarios
+    ):
+        """Ranking yields the same totals and breakdowns as score_scenario."""
+        ranked = Ranking(default_utility_fn.rank_scenarios(
+            sample_scenarios, sample_portfolio, moderate_weights
+        ))
+        for scenario in sample_scenarios:
+            single = default_utility_fn.score_scenario(
+                scenario, sample_portfolio, moderate_weights
+            )
+            ranked_score = ranked.by_id[scenario.scenario_id]
+            assert ranked_score.total_score == single.total_score
+            assert ranked_score.dimension_scores == single.dimension_scores
+
     def test_scenario_with_action_ranks_higher_than_hold(
         self, sample_portfolio, sample_scenarios
     ):
         """Scenario with action should rank higher than hold for concentration issue."""
-        weights = UTILITY_WEIGHTS_BY_PROFILE[RiskProfile.MODERATE_GROWTH]
-
         ranked = score_and_rank(sample_scenarios, sample_portfolio)
 
-        # Find the "Hold Position" scenario
-        hold_score = next(r for r in ranked if r.scenario_id == "scenario-002")
-        action_score = next(r for r in ranked if r.scenario_id == "scenario-001")
+        # Look up the "Hold Position" and rotation scenarios directly
+        hold_score = ranked.by_id["scenario-002"]
+        action_score = ranked.by_id["scenario-001"]
 
         # Action should score higher for addressing concentration
         assert action_score.total_score > hold_score.total_score
 
 
+class TestExpectedOutcomes:
+    """Typed expected-outcomes model tests."""
+
+    def test_dict_input_is_coerced_with_defaults(self):
+        """Scenarios built from a dict get typed outcomes with neutral defaults."""
+        scenario = Scenario(
+            scenario_id="s",
+            title="t",
+            description="d",
+            action_steps=[],
+            expected_outcomes={"tax_impact": -100, "phase_count": 4},
+            risks=[],
+        )
+        outcomes = scenario.expected_outcomes
+
+        assert isinstance(outcomes, ExpectedOutcomes)
+        assert outcomes.tax_impact == -100
+        assert outcomes.target_alignment == 0.5
+        assert outcomes.issue_urgency == 5
+        # Unknown keys are kept and still reachable dict-style
+        assert outcomes.get("phase_count") == 4
+        assert outcomes.get("missing", 0) == 0
+        # Only outcome keys are reachable, not model attributes
+        assert outcomes.get("model_dump") is None
+        assert outcomes.get("model_fields", 0) == 0
+
+    def test_outcomes_serialize_to_json(self):
+        """model_dump gives a json.dumps-safe dict of the keys that were set."""
+        outcomes = ExpectedOutcomes.model_validate(
+            {"tax_impact": -100, "addresses_urgent_issues": True, "phase_count": 4}
+        )
+        payload = json.loads(json.dumps(outcomes.model_dump(exclude_unset=True)))
+
+        assert payload == {
+            "tax_impact": -100,
+            "addresses_urgent_issues": True,
+            "phase_count": 4,
+        }
+
+    def test_outcomes_are_frozen(self):
+        """Outcomes cannot be mutated after construction."""
+        outcomes = ExpectedOutcomes(tax_impact=1.0)
+        with pytest.raises(ValidationError):
+            outcomes.tax_impact = 2.0
+
+
 class TestUtilityWeights:
     """Weight profile tests."""
 
@@ -547,6 +675,12 @@ class TestUtilityWeights:
             )
             assert abs(total - 1.0) < 0.01, f"{profile}: weights sum to {total}"
 
+    def test_preset_weights_are_frozen(self):
+        """Preset weights cannot be changed in place."""
+        weights = UTILITY_WEIGHTS_BY_PROFILE[RiskProfile.CONSERVATIVE]
+        with pytest.raises(ValidationError):
+            weights.risk_reduction = 0.9
+
 
 class TestUtilityFactory:
     """Utility function factory tests."""
@@ -564,6 +698,15 @@ class TestUtilityFactory:
 
         assert utility_fn.config.concentration_limit == 0.20
 
+    def test_default_config_is_shared_and_frozen(self):
+        """Instances without a config share one immutable default."""
+        a = UtilityFunctionFactory.create()
+        b = UtilityFunction()
+
+        assert a.config is b.config
+        with pytest.raises(FrozenInstanceError):
+            a.config.concentration_limit = 0.5
+
     def test_factory_get_weights_for_profile(self):
         """Factory returns correct weights for profile."""
         weights = UtilityFunctionFactory.get_weights_for_profile(
@@ -582,6 +725,18 @@ class TestConvenienceFunction:
         assert len(ranked) == 3
         assert ranked[0].rank == 1
 
+    def test_score_and_rank_keeps_list_behaviour(
+        self, sample_portfolio, sample_scenarios
+    ):
+        """The Ranking result still iterates, indexes and slices like a list."""
+        ranked = score_and_rank(sample_scenarios, sample_portfolio)
+
+        assert isinstance(ranked, Ranking)
+        assert list(ranked) == ranked.ordered
+        assert ranked[-1] is ranked.ordered[-1]
+        assert ranked[:2] == ranked.ordered[:2]
+        assert all(ranked.by_id[s.scenario_id] is s for s in ranked)
+
     def test_score_and_rank_with_profile_override(
         self, sample_portfolio, sample_scenarios
     ):
@@ -603,52 +758,47 @@ class TestConvenienceFunction:
         assert len(ranked_aggressive) == 3
 
 
+@pytest.fixture(scope="class")
+def ranked_scores(
+    default_utility_fn, moderate_weights, sample_portfolio, sample_scenarios
+):
+    """Rank the sample scenarios once per class."""
+    return Ranking(default_utility_fn.rank_scenarios(
+        sample_scenarios, sample_portfolio, moderate_weights
+    ))
+
+
+def _raw_score(utility_score, dimension: str) -> float:
+    """Raw score for one dimension of a UtilityScore."""
+    return next(
+        d.raw_score for d in utility_score.dimension_scores
+        if d.dimension == dimension
+    )
+
+
 class TestDimensionScoring:
     """Individual dimension scoring tests."""
 
-    def test_risk_score_rewards_concentration_reduction(
-        self, sample_portfolio, sample_scenarios
-    ):
+    def test_risk_score_rewards_concentration_reduction(self, ranked_scores):
         """Risk scorer rewards concentration reduction."""
-        utility_fn = UtilityFunction()
-        weights = UTILITY_WEIGHTS_BY_PROFILE[RiskProfile.MODERATE_GROWTH]
-
-        # Score scenario that reduces concentration
-        score_action = utility_fn.score_scenario(
-            sample_scenarios[0], sample_portfolio, weights
-        )
-        # Score hold scenario
-        score_hold = utility_fn.score_scenario(
-            sample_scenarios[1], sample_portfolio, weights
-        )
-
-        # Find risk scores
-        risk_action = next(
-            d for d in score_action.dimension_scores
-            if d.dimension == "risk_reduction"
-        )
-        risk_hold = next(
-            d for d in score_hold.dimension_scores
-            if d.dimension == "risk_reduction"
-        )
+        risk_action = _raw_score(ranked_scores.by_id["scenario-001"], "risk_reduction")
+        risk_hold = _raw_score(ranked_scores.by_id["scenario-002"], "risk_reduction")
 
         # Action should have higher risk score
-        assert risk_action.raw_score > risk_hold.raw_score
+        assert risk_action > risk_hold
 
-    def test_cost_score_favors_fewer_trades(self, sample_portfolio, sample_scenarios):
+    def test_cost_score_favors_fewer_trades(self, ranked_scores):
         """Cost scorer favors scenarios with fewer/smaller trades."""
-        utility_fn = UtilityFunction()
-        weights = UTILITY_WEIGHTS_BY_PROFILE[RiskProfile.MODERATE_GROWTH]
-
-        # Hold has no trades
-        score_hold = utility_fn.score_scenario(
-            sample_scenarios[1], sample_portfolio, weights
-        )
-
-        cost_hold = next(
-            d for d in score_hold.dimension_scores
-            if d.dimension == "transaction_cost"
-        )
-
-        # Hold should have maximum cost score (no costs)
-        assert cost_hold.raw_score == 10.0
+        # Hold has no trades, so it should have maximum cost score
+        assert _raw_score(ranked_scores.by_id["scenario-002"], "transaction_cost") == 10.0
+
+    def test_cost_score_uses_price_lookup(self, sample_portfolio, sample_scenarios):
+        """Precomputed prices give the same cost score as the portfolio scan."""
+        prices = price_lookup(sample_portfolio)
+        assert prices == {"NVDA": 800.00, "AMD": 150.00}
+
+        config = ScoringConfig()
+        for scenario in sample_scenarios:
+            assert CostScorer.score(
+                scenario, sample_portfolio, config, prices
+            ) == CostScorer.score(scenario, sample_portfolio, config)